@@ -10,12 +10,11 @@ from operator import attrgetter, itemgetter
 from pathlib import Path
 from shapely import LineString, MultiLineString
 from shapely.ops import linemerge
-from typing import Tuple
+from typing import Dict, Tuple, Union
 
 filepath = Path(__file__).resolve()
 sys.path.insert(1, filepath.parents[1].as_posix())
 from utils import helpers
-from utils.gui import gui
 
 
 # Set logger.
@@ -30,20 +29,25 @@ logger.addHandler(handler)
 class Confirm:
     """Defines an NRN process."""
 
-    def __init__(self, source: str) -> None:
+    def __init__(self, source: str, dframes: Union[None, Dict[str, Union[gpd.GeoDataFrame, pd.DataFrame]]] = None,
+                 persist: bool = True) -> None:
         """
         Initializes an NRN process.
 
         :param str source: abbreviation for the source province / territory.
+        :param Union[None, Dict[str, Union[gpd.GeoDataFrame, pd.DataFrame]]] dframes: optional dictionary of NRN dataset
+            names and (Geo)DataFrames to process instead of loading the interim GeoPackage, default None.
+        :param bool persist: write the results to the interim GeoPackage, default True.
         """
 
         self.source = source.lower()
+        self.persist = persist
 
         # Configure data paths.
         self.src = filepath.parents[2] / f"data/interim/{self.source}.gpkg"
 
         # Validate source path.
-        if not self.src.exists():
+        if dframes is None and not self.src.exists():
             logger.exception(f"Source not found: \"{self.src}\".")
             sys.exit(1)
 
@@ -60,10 +64,12 @@ class Confirm:
         self.defaults = helpers.compile_default_values()
 
         # Load data - current and previous vintage.
-        self.dframes = helpers.load_gpkg(self.src,
-                                         layers=["blkpassage", "ferryseg", "junction", "roadseg", "tollpoint"])
-        self.dframes_old = helpers.load_gpkg(self.src.parent / f"{self.source}_old.gpkg", find=True,
-                                             layers=["blkpassage", "ferryseg", "junction", "roadseg", "tollpoint"])
+        layers = ["blkpassage", "ferryseg", "junction", "roadseg", "tollpoint"]
+        if dframes is None:
+            self.dframes = helpers.load_gpkg(self.src, layers=layers)
+        else:
+            self.dframes = {table: df for table, df in dframes.items() if table in layers}
+        self.dframes_old = helpers.load_gpkg(self.src.parent / f"{self.source}_old.gpkg", find=True, layers=layers)
 
         # NID change lookup for roadseg.
         self.roadseg_nid_changes = dict(zip(self.dframes["roadseg"]["nid"], self.dframes["roadseg"]["nid"]))
@@ -74,7 +80,9 @@ class Confirm:
         self.gen_nids()
         self.gen_structids()
         self.update_nid_linkages()
-        helpers.export(self.dframes, self.src)
+
+        if self.persist:
+            helpers.export(self.dframes, self.src)
 
     def gen_nids(self) -> None:
         """
@@ -441,6 +449,7 @@ if __name__ == "__main__":
 
     # GUI
     if sys.argv[-1] == "--gui":
+        from utils.gui import gui
         main(args=gui(main, calling_script=Path(__file__).resolve()))
 
     # CLI
@@ -1,15 +1,20 @@
+import ast
 import click
-import fiona
 import geopandas as gpd
+import hashlib
 import logging
 import math
+import multiprocessing as mp
 import numpy as np
 import pandas as pd
+import pyogrio
 import re
+import requests
 import shutil
 import string
 import sys
 import uuid
+import yaml
 import zipfile
 from copy import deepcopy
 from datetime import datetime
@@ -20,7 +25,7 @@ from shapely import LineString
 from tabulate import tabulate
 from tqdm import tqdm
 from tqdm.auto import trange
-from typing import List, Tuple, Union
+from typing import Any, List, Set, Tuple, Union
 
 filepath = Path(__file__).resolve()
 sys.path.insert(1, filepath.parents[1].as_posix())
@@ -28,7 +33,6 @@ import field_map_functions
 from gen_junctions import Junction
 from segment_addresses import Segmentor
 from utils import helpers
-from utils.gui import gui
 
 
 # Set logger.
@@ -43,22 +47,27 @@ logger.addHandler(handler)
 class Conform:
     """Defines an NRN process."""
 
-    def __init__(self, source: str, download_old: bool = True) -> None:
+    def __init__(self, source: str, download_old: bool = True, processes: int = 1, persist: bool = True) -> None:
         """
         Initializes an NRN process.
 
         :param str source: abbreviation for the source province / territory.
         :param bool download_old: indicates whether previous NRN vintage, used for recovery of unprovided datasets and
             continuity of NIDs, should be (re-)downloaded. Has no affect if previous NRN vintage does not already exist.
+        :param int processes: number of worker processes used to load source data concurrently, default 1.
+        :param bool persist: write the results to the interim GeoPackage, default True.
         """
 
         self.source = source.lower()
         self.download_old = download_old
+        self.processes = processes
+        self.persist = persist
 
         # Configure data paths.
         self.src = filepath.parents[2] / f"data/raw/{self.source}"
         self.dst = filepath.parents[2] / f"data/interim/{self.source}.gpkg"
-        self.src_old = {ext: filepath.parents[2] / f"data/interim/{self.source}_old.{ext}" for ext in ("gpkg", "zip")}
+        self.src_old = {"gpkg": filepath.parents[2] / f"data/interim/{self.source}_old.gpkg"}
+        self.cache_dir = filepath.parents[2] / "data/cache"
 
         # Configure attribute paths.
         self.source_attribute_path = filepath.parent / f"sources/{self.source}"
@@ -97,7 +106,9 @@ class Conform:
         self.filter_strplaname()
         self.drop_isolated_linkages()
         self.gen_junctions()
-        helpers.export(self.target_gdframes, self.dst)
+
+        if self.persist:
+            helpers.export(self.target_gdframes, self.dst)
 
     def apply_domains(self) -> None:
         """Applies domain restrictions to each column in the target (Geo)DataFrames."""
@@ -778,6 +789,49 @@ class Conform:
             # Load yaml and store contents.
             self.source_attributes[f.stem] = helpers.load_yaml(f)
 
+    def compile_source_fields(self, source: str, fields: List[str]) -> Union[None, List[str]]:
+        """
+        Compiles the subset of source fields referenced by the field mapping, address segmentation, and query
+        definitions, such that only required fields are loaded from the source data.
+
+        :param str source: source yaml name.
+        :param List[str] fields: source layer field names.
+        :return Union[None, List[str]]: list of required source field names, or None if all fields are required.
+        """
+
+        def _compile_values(obj: Any) -> Set[str]:
+            """
+            Recursively compiles all scalar values from a yaml-constructed object as lowercase strings.
+
+            :param Any obj: yaml-constructed object.
+            :return Set[str]: set of lowercase string values.
+            """
+
+            if isinstance(obj, dict):
+                return set().union(*map(_compile_values, obj.values()))
+            if isinstance(obj, list):
+                return set().union(*map(_compile_values, obj))
+            if isinstance(obj, (str, int, float)):
+                return {str(obj).lower()}
+            return set()
+
+        # Compile values referenced by the field mapping and all address segmentation definitions.
+        # Note: raw values are indistinguishable from field names at this stage, unmatched values are simply ignored.
+        values = _compile_values(self.source_attributes[source].get("conform"))
+        for source_yaml in self.source_attributes.values():
+            values.update(_compile_values(source_yaml["data"].get("segment")))
+
+        # Compile fields referenced by the query.
+        query = self.source_attributes[source]["data"]["query"]
+        if query:
+            try:
+                values.update(node.id.lower() for node in ast.walk(ast.parse(query, mode="eval"))
+                              if isinstance(node, ast.Name))
+            except SyntaxError:
+                return None
+
+        return [field for field in fields if field.lower() in values]
+
     def compile_target_attributes(self) -> None:
         """Compiles the yaml file for the target (Geo)DataFrames (distribution format) into a dictionary."""
 
@@ -800,7 +854,11 @@ class Conform:
             sys.exit(1)
 
     def download_previous_vintage(self) -> None:
-        """Downloads the previous NRN vintage and extracts the English GeoPackage as <source>_old.gpkg."""
+        """
+        Downloads the previous NRN vintage and extracts the English GeoPackage as <source>_old.gpkg. Downloads are
+        cached by url and only re-downloaded if the remote content has changed, based on the ETag / Last-Modified
+        response headers.
+        """
 
         logger.info("Retrieving previous NRN vintage.")
 
@@ -810,8 +868,6 @@ class Conform:
 
         else:
 
-            # Download previous NRN vintage.
-            logger.info("Downloading previous NRN vintage.")
             download_url = None
 
             try:
@@ -820,33 +876,64 @@ class Conform:
                 download_url = helpers.load_yaml(
                     filepath.parents[1] / "downloads.yaml")["previous_nrn_vintage"][self.source]
 
-                # Get raw content stream from download url.
-                download = helpers.get_url(download_url, stream=True, timeout=30, verify=True)
+                # Configure cache paths, keyed by download url.
+                key = hashlib.sha256(download_url.encode("utf-8")).hexdigest()
+                cache = {ext: self.cache_dir / f"{key}.{ext}" for ext in ("zip", "yaml")}
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+                # Compile conditional request headers from cached response headers.
+                headers = dict()
+                if cache["zip"].exists() and cache["yaml"].exists():
+                    cache_headers = helpers.load_yaml(cache["yaml"])
 
-                # Copy download content to file.
-                with open(self.src_old["zip"], "wb") as f:
-                    shutil.copyfileobj(download.raw, f)
+                    # Treat an empty or invalid cache yaml as a cache miss.
+                    if not isinstance(cache_headers, dict):
+                        logger.warning(f"Invalid cache yaml: \"{cache['yaml']}\". Downloading previous NRN vintage.")
+                        cache_headers = dict()
 
-            except shutil.Error as e:
+                    if cache_headers.get("etag"):
+                        headers["If-None-Match"] = cache_headers["etag"]
+                    if cache_headers.get("last_modified"):
+                        headers["If-Modified-Since"] = cache_headers["last_modified"]
+
+                # Download content to cache file, resuming any partial download.
+                download, digest = helpers.download(download_url, cache["zip"], headers=headers, timeout=30,
+                                                    verify=True)
+
+                # Use cached download if the remote content has not changed.
+                if download.status_code == 304:
+                    logger.info(f"Previous NRN vintage has not changed. Using cached download: \"{cache['zip']}\".")
+
+                # Store cache response headers.
+                else:
+                    with open(cache["yaml"], "w") as f:
+                        yaml.safe_dump({"url": download_url, "etag": download.headers.get("ETag"),
+                                        "last_modified": download.headers.get("Last-Modified"), "sha256": digest}, f)
+
+            except (requests.exceptions.HTTPError, OSError) as e:
                 logger.exception(f"Unable to download previous NRN vintage: \"{download_url}\".")
                 logger.exception(e)
                 sys.exit(1)
 
             # Extract zipped data.
-            logger.info("Extracting zipped data for previous NRN vintage.")
+            with zipfile.ZipFile(cache["zip"], "r") as zip_f:
+
+                gpkg_download = zip_f.getinfo([f for f in zip_f.namelist() if
+                                               f.lower().startswith("nrn") and Path(f).suffix == ".gpkg"][0])
 
-            gpkg_download = [f for f in zipfile.ZipFile(self.src_old["zip"], "r").namelist() if
-                             f.lower().startswith("nrn") and Path(f).suffix == ".gpkg"][0]
+                # Determine extraction requirement.
+                if self.src_old["gpkg"].exists() and \
+                        self.src_old["gpkg"].stat().st_size == gpkg_download.file_size and \
+                        self.src_old["gpkg"].stat().st_mtime >= cache["zip"].stat().st_mtime:
+                    logger.info("Previous NRN vintage already extracted from cached download. Skipping extraction.")
 
-            with zipfile.ZipFile(self.src_old["zip"], "r") as zip_f:
-                with zip_f.open(gpkg_download) as zsrc, open(self.src_old["gpkg"], "wb") as zdst:
-                    shutil.copyfileobj(zsrc, zdst)
+                else:
 
-            # Remove temporary files.
-            logger.info("Removing temporary files for previous NRN vintage.")
+                    # Stream GeoPackage directly from cached zip file.
+                    logger.info("Extracting zipped data for previous NRN vintage.")
 
-            if self.src_old["zip"].exists():
-                self.src_old["zip"].unlink()
+                    with zip_f.open(gpkg_download) as zsrc, open(self.src_old["gpkg"], "wb") as zdst:
+                        shutil.copyfileobj(zsrc, zdst)
 
     def drop_isolated_linkages(self):
         """Drops all isolated NID linkages."""
@@ -966,61 +1053,69 @@ class Conform:
         1) explode multi-type geometries.
         2) reprojection to NRN standard EPSG:4617.
         3) round coordinate precision to NRN standard 7 decimal places.
+
+        Multiple sources are loaded concurrently if more than one process is configured.
         """
 
         logger.info("Loading source data as dataframes.")
         self.source_gdframes = dict()
+        tasks = list()
 
+        # Compile loading parameters for each source.
         for source, source_yaml in self.source_attributes.items():
 
-            logger.info(f"Loading source data for {source}.yaml: file={source_yaml['data']['filename']}, layer="
-                        f"{source_yaml['data']['layer']}.")
+            # Translate query into an attribute filter, if possible.
+            query = source_yaml["data"]["query"]
+            where = helpers.translate_query(query) if query else None
 
-            # Load source data into a geodataframe.
+            # Compile required fields.
             try:
-
-                df = gpd.read_file(self.src / source_yaml["data"]["filename"], layer=source_yaml["data"]["layer"])
-
-            except fiona.errors.FionaValueError as e:
-                logger.exception(f"Unable to load data source.")
+                fields = pyogrio.read_info(self.src / source_yaml["data"]["filename"],
+                                           layer=source_yaml["data"]["layer"])["fields"]
+            except (pyogrio.errors.DataLayerError, pyogrio.errors.DataSourceError) as e:
+                logger.exception(f"Unable to load data source for {source}.yaml.")
                 logger.exception(e)
                 sys.exit(1)
 
-            # Query dataframe.
-            if source_yaml["data"]["query"]:
-                try:
-                    df.query(source_yaml["data"]["query"], inplace=True)
-                except ValueError as e:
-                    logger.exception(f"Invalid query: \"{source_yaml['data']['query']}\".")
-                    logger.exception(e)
-                    sys.exit(1)
+            tasks.append((source, {"path": self.src / source_yaml["data"]["filename"],
+                                   "layer": source_yaml["data"]["layer"],
+                                   "columns": self.compile_source_fields(source, fields),
+                                   "where": where,
+                                   "query": None if where else query,
+                                   "spatial": source_yaml["data"]["spatial"],
+                                   "crs": source_yaml["data"]["crs"]}))
 
-            # Force lowercase column names.
-            df.columns = map(str.lower, df.columns)
+        try:
 
-            # Apply spatial data modifications.
-            if source_yaml["data"]["spatial"]:
+            # Load sources concurrently.
+            # Note: geometries are returned as WKB to avoid pickling shapely objects.
+            if self.processes > 1 and len(tasks) > 1:
 
-                # Filter invalid geometries.
-                df = df.loc[df.geom_type.isin({"Point", "MultiPoint", "LineString", "MultiLineString"})]
+                context = mp.get_context("fork" if "fork" in mp.get_all_start_methods() else None)
+                with context.Pool(processes=min(self.processes, len(tasks))) as pool:
 
-                # Cast multi-type geometries.
-                df = helpers.explode_geometry(df)
+                    for source, df, name, crs in pool.imap_unordered(_load_source, tasks):
 
-                # Explicitly assign CRS and reproject to EPSG:4617.
-                df.set_crs(source_yaml["data"]["crs"], allow_override=True, inplace=True)
-                df = df.to_crs("EPSG:4617")
+                        # Decode WKB geometries.
+                        if name is not None:
+                            df[name] = gpd.GeoSeries.from_wkb(df[name], index=df.index, crs=crs)
+                            df = gpd.GeoDataFrame(df, geometry=name, crs=crs)
 
-                # Round coordinates to decimal precision = 7 and flatten to 2-dimensions.
-                df = helpers.round_coordinates(df, 7)
+                        self.source_gdframes[source] = df
 
-            # Add uuid field.
-            df["uuid"] = [uuid.uuid4().hex for _ in range(len(df))]
+            # Load sources sequentially.
+            else:
+                for source, kwargs in tasks:
+                    self.source_gdframes[source] = self.load_source(**kwargs)
 
-            # Store result.
-            self.source_gdframes[source] = df.copy(deep=True)
+        except (pyogrio.errors.DataLayerError, pyogrio.errors.DataSourceError, pyogrio.errors.FieldError,
+                RuntimeError, ValueError) as e:
+            logger.exception(f"Unable to load data source.")
+            logger.exception(e)
+            sys.exit(1)
 
-            logger.info("Successfully loaded source data.")
+        # Restore source order.
+        self.source_gdframes = {source: self.source_gdframes[source] for source in self.source_attributes}
 
     def gen_target_dataframes(self) -> None:
         """Creates empty (Geo)DataFrames for all applicable output tables."""
@@ -1061,6 +1156,64 @@ class Conform:
 
             logger.warning(f"Source data provides no field mappings for table: {table}.")
 
+    @staticmethod
+    def load_source(path: Path, layer: Union[None, str], columns: Union[None, List[str]], where: Union[None, str],
+                    query: Union[None, str], spatial: bool, crs: Union[None, str]) -> \
+            Union[gpd.GeoDataFrame, pd.DataFrame]:
+        """
+        Loads a raw data source into a (Geo)DataFrame and applies a series of standardizations, most notably:
+        1) explode multi-type geometries.
+        2) reprojection to NRN standard EPSG:4617.
+        3) round coordinate precision to NRN standard 7 decimal places.
+
+        :param Path path: path to the data source.
+        :param Union[None, str] layer: layer name, if any.
+        :param Union[None, List[str]] columns: list of field names to load, or None for all fields.
+        :param Union[None, str] where: OGR SQL attribute filter, if any.
+        :param Union[None, str] query: pandas query, if any.
+        :param bool spatial: indicates whether the data source is spatial.
+        :param Union[None, str] crs: CRS of the data source.
+        :return Union[gpd.GeoDataFrame, pd.DataFrame]: (Geo)DataFrame.
+        """
+
+        logger.info(f"Loading source data: file={path.name}, layer={layer}.")
+
+        # Load source data into a geodataframe.
+        df = gpd.read_file(path, layer=layer, engine="pyogrio", columns=columns, where=where)
+
+        # Query dataframe, if the query could not be applied as an attribute filter.
+        if query:
+            try:
+                df.query(query, inplace=True)
+            except ValueError as e:
+                raise ValueError(f"Invalid query: \"{query}\".") from e
+
+        # Force lowercase column names.
+        df.columns = map(str.lower, df.columns)
+
+        # Apply spatial data modifications.
+        if spatial:
+
+            # Filter invalid geometries.
+            df = df.loc[df.geom_type.isin({"Point", "MultiPoint", "LineString", "MultiLineString"})]
+
+            # Cast multi-type geometries.
+            df = helpers.explode_geometry(df)
+
+            # Explicitly assign CRS and reproject to EPSG:4617.
+            df.set_crs(crs, allow_override=True, inplace=True)
+            df = df.to_crs("EPSG:4617")
+
+            # Round coordinates to decimal precision = 7 and flatten to 2-dimensions.
+            df = helpers.round_coordinates(df, 7)
+
+        # Add uuid field.
+        df["uuid"] = [uuid.uuid4().hex for _ in range(len(df))]
+
+        logger.info(f"Successfully loaded source data: file={path.name}, layer={layer}.")
+
+        return df
+
     def recover_missing_datasets(self) -> None:
         """
         Recovers missing NRN datasets in the current vintage from the previous vintage.
@@ -1232,13 +1385,41 @@ class Conform:
                                                                ignore_index=False).copy(deep=True)
 
 
+def _load_source(task: Tuple[str, dict]) -> Tuple[str, pd.DataFrame, Union[None, str], Any]:
+    """
+    Loads a raw data source within a worker process.
+
+    :param Tuple[str, dict] task: source yaml name and keyword arguments passed to :func:`Conform.load_source`.
+    :return Tuple[str, pd.DataFrame, Union[None, str], Any]: source yaml name, DataFrame with geometries encoded as WKB,
+        geometry column name, and CRS. The geometry column name and CRS are None for tabular data.
+    """
+
+    source, kwargs = task
+
+    # Load source, re-raising exits as exceptions.
+    # Note: pool workers do not return a result for exits, which would block the parent process indefinitely.
+    try:
+        df = Conform.load_source(**kwargs)
+    except SystemExit:
+        raise RuntimeError(f"Unable to load source: {source}.") from None
+
+    # Encode geometries as WKB.
+    if isinstance(df, gpd.GeoDataFrame):
+        name = df.geometry.name
+        return source, pd.DataFrame(df).assign(**{name: df.geometry.to_wkb()}), name, df.crs
+
+    return source, df, None, None
+
+
 @click.command()
 @click.argument("source", type=click.Choice(["ab", "bc", "mb", "nb", "nl", "ns", "nt", "nu", "on",
                                              "pe", "qc", "sk", "yt"], case_sensitive=False))
 @click.option("-d", "--download_old", type=click.BOOL, default=True, show_default=True,
               help="Indicates whether previous NRN vintage, used for recovery of unprovided datasets and continuity "
                    "of NIDs, should be (re-)downloaded. Has no affect if previous NRN vintage does not already exist.")
-def main(source: str, download_old: bool = True) -> None:
+@click.option("-p", "--processes", type=click.INT, default=1, show_default=True,
+              help="Number of worker processes used to load source data concurrently.")
+def main(source: str, download_old: bool = True, processes: int = 1) -> None:
     """
     Executes an NRN process.
 
@@ -1246,13 +1427,14 @@ def main(source: str, download_old: bool = True) -> None:
     :param str source: abbreviation for the source province / territory.
     :param bool download_old: indicates whether previous NRN vintage, used for recovery of unprovided datasets and
         continuity of NIDs, should be (re-)downloaded. Has no affect if previous NRN vintage does not already exist.
+    :param int processes: number of worker processes used to load source data concurrently, default 1.
     """
 
     try:
 
         @helpers.timer
         def run():
-            process = Conform(source, download_old)
+            process = Conform(source, download_old, processes)
             process()
 
         run()
@@ -1266,6 +1448,7 @@ if __name__ == "__main__":
 
     # GUI
     if sys.argv[-1] == "--gui":
+        from utils.gui import gui
         main(args=gui(main, calling_script=Path(__file__).resolve()))
 
     # CLI
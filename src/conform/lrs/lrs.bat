@@ -4,7 +4,7 @@ rem Activate conda env.
 call conda activate nrn-rrn
 
 rem Execute python script.
-python lrs_convert.py --gui
+python lrs.py --gui
 pause
 
 rem deactivate conda env.
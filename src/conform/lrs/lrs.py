@@ -0,0 +1,1353 @@
+import click
+import geopandas as gpd
+import logging
+import multiprocessing as mp
+import numpy as np
+import pandas as pd
+import pyogrio
+import shapely
+import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy
+from functools import lru_cache
+from itertools import chain
+from operator import attrgetter, itemgetter
+from pathlib import Path
+from pyproj import Transformer
+from shapely import LineString, MultiLineString, Point
+from typing import Dict, List, Tuple, Union
+
+filepath = Path(__file__).resolve()
+sys.path.insert(1, filepath.parents[2].as_posix())
+from utils import helpers
+
+
+# Set logger.
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+handler = logging.StreamHandler(sys.stdout)
+handler.setLevel(logging.INFO)
+handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s: %(message)s", "%Y-%m-%d %H:%M:%S"))
+logger.addHandler(handler)
+
+
+# Define LRS reference for worker processes.
+_lrs = None
+
+
+def _init_worker(lrs: "LRS") -> None:
+    """
+    Stores the LRS instance for the current worker process. Called once per worker process.
+
+    :param LRS lrs: LRS instance.
+    """
+
+    global _lrs
+    _lrs = lrs
+
+
+def _run_partition(index: int) -> Tuple[Dict[str, Union[gpd.GeoDataFrame, pd.DataFrame]], pd.DataFrame]:
+    """
+    Processes a single connection ID partition within a worker process.
+
+    :param int index: partition index.
+    :return Tuple[Dict[str, Union[gpd.GeoDataFrame, pd.DataFrame]], pd.DataFrame]: dictionary of NRN dataset names and
+        (Geo)DataFrames and DataFrame of overlapping event measurements for the partition.
+    """
+
+    # Process partition, re-raising exits as exceptions.
+    # Note: pool workers do not return a result for exits, which would block the parent process indefinitely.
+    try:
+        return _lrs.run_partition(index)
+    except SystemExit:
+        raise RuntimeError(f"Unable to process partition {index + 1} of {_lrs.partitions}.") from None
+
+
+@lru_cache(maxsize=None)
+def get_transformer(crs_from: str, crs_to: str) -> Transformer:
+    """
+    Fetches a cached coordinate transformer between two CRS.
+
+    :param str crs_from: source CRS.
+    :param str crs_to: target CRS.
+    :return Transformer: pyproj Transformer.
+    """
+
+    return Transformer.from_crs(crs_from, crs_to, always_xy=True)
+
+
+class LRS:
+    """Class to convert Linear Reference System (LRS) data to GeoPackage, driven by a source-specific LRS schema."""
+
+    def __init__(self, source: str, src: Path, dst: Path, processes: int = 1, partitions: Union[None, int] = None) \
+            -> None:
+        """
+        Initializes the LRS conversion class.
+
+        :param str source: abbreviation for the source province / territory.
+        :param Union[Path, str] src: Path to an input File GeoDatabase (.gdb).
+        :param Union[Path, str] dst: Path to an output GeoPackage (.gpkg).
+        :param int processes: number of worker processes used to process connection ID partitions concurrently,
+            default 1.
+        :param Union[None, int] partitions: number of connection ID partitions into which the source datasets are
+            split, default None (equal to the number of processes).
+        """
+
+        self.source = source.lower()
+        self.src = src
+        self.dst = dst
+        self.processes = max(processes, 1)
+        self.partitions = max(partitions or self.processes, 1)
+        self.partition_indexes = dict()
+        self.nrn_datasets = dict()
+        self.src_datasets = dict()
+        self.event_overlaps = None
+
+        # Load LRS schema.
+        self.lrs_schema_path = filepath.parent / f"schemas/{self.source}.yaml"
+        lrs_schema = helpers.load_yaml(self.lrs_schema_path)
+
+        self.base_dataset = lrs_schema["base_dataset"]
+        self.geometry_dataset = lrs_schema["geometry_dataset"]
+        self.event_measurement_fields = lrs_schema["event_measurements"]["fields"]
+        self.event_measurement_factor = lrs_schema["event_measurements"]["factor"]
+        self.invalid_event_measurements = lrs_schema["event_measurements"]["invalid"]
+        self.calibrations = lrs_schema["calibrations"]
+        self.geometry = lrs_schema["geometry"]
+        self.point_datasets = lrs_schema["point_datasets"]
+        self.point_event_measurement_field = lrs_schema["point_event_measurement_field"]
+
+        # Dataset import specifications.
+        # Note: output fields must use the renamed field names.
+        self.schema = lrs_schema["schema"]
+
+        # Connections between datasets to the main (base) dataset.
+        # Note: connection fields must use the renamed field names.
+        self.structure = lrs_schema["structure"]
+
+        # Connections between non-main (base) datasets.
+        # Note: connection fields must use the renamed field names.
+        self.structure_non_base = lrs_schema["structure_non_base"]
+
+        # Input dataset columns to be renamed upon import.
+        self.rename = lrs_schema["rename"]
+
+        # Define composite datasets (datasets to be split into multiple datasets).
+        # Note: output fields must use the renamed field names.
+        self.composite_datasets = lrs_schema["composite_datasets"]
+
+        # Define queries to separate final (NRN) datasets.
+        self.final_dataset_separations = lrs_schema["final_dataset_separations"]
+
+        # Validate src.
+        if self.src.suffix != ".gdb":
+            logger.exception(f"Invalid src input: {self.src}. Must be a File GeoDatabase.")
+            sys.exit(1)
+
+        # Validate dst.
+        if self.dst.suffix != ".gpkg":
+            logger.exception(f"Invalid dst input: {self.dst}. Must be a GeoPackage.")
+            sys.exit(1)
+
+    def __call__(self) -> None:
+        """Executes class functionality."""
+
+        self.compile_source_datasets()
+        self.assemble_non_base_linkages()
+        self.separate_composite_datasets()
+        self.configure_valid_records()
+        self.process_partitions()
+        if self.geometry["split_at_intersections"]:
+            self.split_at_intersections()
+        self.standardize_projections()
+        self.separate_final_datasets()
+        self.export_gpkg()
+
+    def assemble_network_attribution(self) -> None:
+        """Assembles all required attributes from the source datasets to the segmented road network."""
+
+        def fetch_attr_indexes(base_sub: pd.DataFrame, df_sub: pd.DataFrame) -> pd.Series:
+            """
+            Fetches, for each base record, the index of the first attribute record (ordered by event measurement) which
+            matches the connection ID and overlaps the breakpoint interval. All base records are resolved at once via
+            binary searches against the sorted attribute records.
+
+            :param pd.DataFrame base_sub: base DataFrame with connection ID and breakpoints fields.
+            :param pd.DataFrame df_sub: attribute DataFrame with connection ID and event measurement fields.
+            :return pd.Series: Series of attribute indexes, indexed by base record, for all base records with an
+                overlapping attribute record.
+            """
+
+            # Sort attribute records by connection ID and event measurements.
+            df_sub = df_sub.sort_values(by=[con_id_field, "from", "to"], kind="stable")
+
+            # Configure connection ID codes, ordered identically to the sorted attribute records.
+            con_ids = pd.Index(df_sub[con_id_field].unique())
+            codes = con_ids.get_indexer(df_sub[con_id_field])
+            base_codes = con_ids.get_indexer(base_sub[con_id_field])
+
+            # Compile sorted search keys for the event measurements of each connection ID.
+            # Note: complex values are ordered by their real, then imaginary, components. Combining the connection ID
+            # code (real) and event measurement (imaginary) allows all connection IDs to be searched at once.
+            # Note: cumulative maximums of the 'to' measurements preserve the sort order for overlapping events.
+            from_keys = codes + 1j * df_sub["from"].to_numpy(dtype=float)
+            to_keys = codes + 1j * df_sub.groupby(by=con_id_field, sort=False)["to"].cummax().to_numpy(dtype=float)
+
+            # Compile breakpoint intervals.
+            breakpts = base_sub[["breakpt_from", "breakpt_to"]].to_numpy(dtype=float)
+
+            # Identify the first attribute record which ends after the breakpoint interval start (low) and the number of
+            # attribute records which start before the breakpoint interval end (high). Any low < high is the first
+            # overlapping attribute record.
+            low = np.searchsorted(to_keys, base_codes + 1j * breakpts[:, 0], side="right")
+            high = np.searchsorted(from_keys, base_codes + 1j * breakpts[:, 1], side="left")
+            flag = low < high
+
+            return pd.Series(df_sub.index[low[flag]], index=base_sub.index[flag])
+
+        # Assemble attributes from source datasets.
+        logger.info(f"Assembling attributes from source datasets.")
+
+        base = self.nrn_datasets["roadseg"]
+
+        # Plan attribute names for all source datasets that are connected to the base dataset and have columns to be
+        # kept on output, excluding point datasets. Add a suffix to columns already in base dataset.
+        # Note: Underscore suffixes are applied to conflicting field names. For certain fields, such as dates, it may be
+        # useful to keep multiple instances.
+        plans = list()
+        columns = set(base.columns)
+        for con_id_field, names in self.structure["connections"].items():
+            for name in [n for n in names if self.schema[n]["output_fields"] and n not in self.point_datasets]:
+
+                df_columns = set(self.src_datasets[name].columns)
+                rename = dict()
+                for col in self.schema[name]["output_fields"]:
+                    col_new = col
+                    while col_new in columns:
+                        col_new += "_"
+                        while col_new in df_columns:
+                            col_new += "_"
+                    df_columns = (df_columns - {col}) | {col_new}
+                    columns.add(col_new)
+                    rename[col] = col_new
+
+                plans.append((con_id_field, name, rename))
+
+        # Iterate attribute plans and compile the attributes of each base record.
+        attrs = list()
+        for con_id_field, name, rename in plans:
+
+            logger.info(f"Assembling attributes from dataset: {name}.")
+
+            df = self.src_datasets[name]
+            idxs = list()
+
+            # Handle singular (non-segmented) matches.
+            # Flag base records and fetch the index of the first attribute record of each connection ID.
+            # Note: keeping the first record ensures that one-to-many matches between the base and attribute dataset
+            # will still have an attribute record to link to.
+            # Note: datasets without event measurements apply to all segments of the connected feature.
+            flag_base = base[con_id_field].isin(set(df[con_id_field]))
+            if {"from", "to"}.issubset(df.columns):
+                flag_base &= ~base[con_id_field].duplicated(keep=False)
+            first = df[con_id_field].drop_duplicates(keep="first")
+            idxs.append(base.loc[flag_base, con_id_field].map(pd.Series(first.index, index=first.to_numpy())))
+
+            # Handle plural (segmented) matches.
+            if {"from", "to"}.issubset(df.columns):
+
+                # Flag base records and filter attributes dataframe to relevant records.
+                flag_base = base[con_id_field].isin(set(df[con_id_field])) & base[con_id_field].duplicated(keep=False)
+                df_sub = df.loc[df[con_id_field].isin(set(base.loc[flag_base, con_id_field])),
+                                [con_id_field, "from", "to"]]
+
+                # Fetch the indexes of the attribute dataset which correspond to the base dataset.
+                idxs.append(fetch_attr_indexes(base.loc[flag_base, [con_id_field, "breakpt_from", "breakpt_to"]],
+                                               df_sub))
+
+            # Compile attributes, indexed identically to the base dataset.
+            # Note: non-matched records are assigned Nones.
+            idx = pd.concat(idxs)
+            values = np.full((len(base), len(rename)), None, dtype=object)
+            values[base.index.get_indexer(idx.index)] = df.loc[idx.to_numpy(), list(rename)].to_numpy(dtype=object)
+            attrs.append(pd.DataFrame(values, index=base.index, columns=list(rename.values())))
+
+        # Update base dataset with all attributes at once.
+        if len(attrs):
+            base = pd.concat([base, *attrs], axis=1)
+
+        # Resolve conflicting attributes.
+        # Note: dates are likely the only attributes which require conflict resolution.
+        logger.info(f"Resolving conflicting attributes.")
+
+        # Iterate and compile fields with potential conflicts.
+        for field, params in {
+            "credate": {"func": min, "isdate": True},
+            "revdate": {"func": max, "isdate": True}
+        }.items():
+
+            cols = [col for col in base.columns if col.find(field) >= 0]
+
+            # Convert date fields to datetime objects.
+            # Note: the converted values are cast to a datetime dtype since a partition may lack any date values.
+            if params["isdate"]:
+                for col in cols:
+                    base[col] = pd.to_datetime(base[col].map(pd.to_datetime)).dt.strftime("%Y%m%d")
+
+            # Apply function to conflicting columns, if required.
+            if len(cols) > 1:
+
+                logger.info(f"Resolving conflicting attributes for: {field}.")
+
+                # Resolve conflicts into a single attribute.
+                base[field] = base[cols].apply(lambda row: tuple(filter(lambda v: not pd.isna(v), row)), axis=1)
+                base[field] = base[field].map(lambda vals: params["func"](vals) if len(vals) else None)
+
+        # Remove excess fields, excluding breakpoints, geometry, epsg, and connection ID fields.
+        # Note: breakpoints and connection ID fields are required to locate point events and are removed once point
+        # datasets are created, unless connection ID fields are output fields.
+        cols_keep = set(chain.from_iterable(props["output_fields"] for props in self.schema.values() if
+                                            props["output_fields"]))\
+            .union({"breakpt_from", "breakpt_to", "epsg", "geometry", *set(self.structure["connections"])})
+        base = base.drop(columns=set(base.columns)-cols_keep)
+
+        # Store result.
+        self.nrn_datasets["roadseg"] = base.copy(deep=True)
+
+    def assemble_non_base_linkages(self) -> None:
+        """
+        Assembles dataset linkages which are not against the base dataset. Output column names are planned up front and
+        all datasets linked via the same connection field are merged at once.
+        """
+
+        logger.info(f"Assembling non-base dataset linkages.")
+
+        # Iterate non-base linkages.
+        for base_name in self.structure_non_base:
+            base = self.src_datasets[base_name]
+            columns = set(base.columns)
+
+            # Iterate connection fields.
+            for con_id_field, linked_names in self.structure_non_base[base_name].items():
+                if not len(linked_names):
+                    continue
+
+                logger.info(f"Assembling dataset linkage: {base_name} - {', '.join(linked_names)}")
+
+                # Plan linked datasets, indexed by connection ID. Add a suffix to columns already planned.
+                linked_dfs = list()
+                for linked_index, linked_name in enumerate(linked_names):
+
+                    suff = "_" * (linked_index + 1)
+                    df = self.src_datasets[linked_name].set_index(con_id_field)
+                    rename = {col: f"{col}{suff}" for col in df.columns if col in columns}
+                    columns.update(rename.get(col, col) for col in df.columns)
+                    linked_dfs.append(df.rename(columns=rename))
+
+                    # Replace output fields with suffixed names and merge output fields.
+                    self.schema[linked_name]["output_fields"] = [rename.get(field, field) for field in
+                                                                 self.schema[linked_name]["output_fields"]]
+                    self.schema[base_name]["output_fields"].extend(self.schema[linked_name]["output_fields"])
+
+                    # Remove linked dataset.
+                    del self.src_datasets[linked_name]
+                    if linked_name in self.point_datasets:
+                        del self.point_datasets[linked_name]
+                    del self.schema[linked_name]
+
+                # Report the row fan-out of the linkage.
+                # Note: each record is repeated once for every combination of linked records.
+                fanout = pd.Series(1, index=base.index)
+                for df in linked_dfs:
+                    fanout *= base[con_id_field].map(df.index.value_counts()).fillna(1).astype(int)
+
+                logger.info(f"Linkage fan-out: {len(base)} records will expand to {fanout.sum()} records.")
+                if fanout.sum() > len(base):
+                    logger.warning(f"One-to-many linkage identified between {base_name} and "
+                                   f"{', '.join(linked_names)} on {con_id_field}: {sum(fanout > 1)} records will "
+                                   f"expand to {fanout.loc[fanout > 1].sum()} records.")
+
+                # Merge datasets.
+                linked = linked_dfs[0].join(linked_dfs[1:], how="outer") if len(linked_dfs) > 1 else linked_dfs[0]
+                base = base.merge(linked, how="left", left_on=con_id_field, right_index=True).reset_index(drop=True)
+
+            # Store merged results.
+            self.src_datasets[base_name] = base
+
+    def assemble_segmented_network(self) -> None:
+        """Assembles a segmented road network from the breakpoints (event measurements) of the source datasets."""
+
+        calibrations_df = self.src_datasets[self.calibrations["dataset"]] if self.calibrations else None
+
+        def convert_to_individual_utm_zones(df: gpd.GeoDataFrame) -> pd.DataFrame:
+            """
+            Returns a DataFrame with each geometry reprojected to the corresponding UTM zone of its centroid. The EPSG
+            code of each UTM zone is stored in the field 'epsg'.
+
+            :param gpd.GeoDataFrame df: GeoDataFrame.
+            :return pd.DataFrame: DataFrame with individually reprojected geometries.
+            """
+
+            crs = df.crs.to_string()
+
+            # Compile geometry centroids as latitude and longitude.
+            centroids = shapely.centroid(df["geometry"].array)
+            lon, lat = shapely.get_x(centroids), shapely.get_y(centroids)
+            if not df.crs.is_geographic:
+                lon, lat = get_transformer(crs, "EPSG:4617").transform(lon, lat)
+
+            # Configure UTM EPSG codes.
+            df = pd.DataFrame(df)
+            df["epsg"] = (32700 - np.round((45 + lat) / 90) * 100 + np.round((183 + lon) / 6)).astype(int)
+
+            # Reproject geometries according to EPSG.
+            # Note: the DataFrame has no common CRS, the actual data is in a unique CRS per record.
+            df["geometry"] = self.transform_utm_zones(df["geometry"].to_numpy(), df["epsg"].to_numpy(), crs=crs)
+
+            return df
+
+        def segment_geometries(geoms: np.ndarray, line_idxs: np.ndarray, breakpts: np.ndarray) -> np.ndarray:
+            """
+            Segments (Multi)LineStrings at pairs of breakpoints. To increase splitting accuracy, breakpoints are snapped
+            to pre-existing nodes in the geometry, where possible (tolerance = 1 unit). All segments are processed at
+            once using the cumulative node measures of each LineString.
+
+            :param np.ndarray geoms: array of (Multi)LineStrings.
+            :param np.ndarray line_idxs: array of (Multi)LineString indexes, one per segment.
+            :param np.ndarray breakpts: array of breakpoint pairs (event measurements), one per segment.
+            :return np.ndarray: array of LineStrings, segmented from the original geometries.
+            """
+
+            # Explode geometries to LineStrings and compile the measure offset of each LineString within its geometry.
+            geoms, part_lines = shapely.get_parts(geoms, return_index=True)
+            part_offsets = np.cumsum(shapely.length(geoms))
+            part_offsets = np.concatenate([[0], part_offsets[:-1]])
+            part_offsets -= part_offsets[np.searchsorted(part_lines, part_lines, side="left")]
+
+            # Assign each segment to the LineString which contains the midpoint of its breakpoints and convert the
+            # breakpoints to measures along that LineString.
+            # Note: complex values are ordered by their real, then imaginary, components.
+            part_idxs = np.searchsorted(part_lines + 1j * part_offsets, line_idxs + 1j * breakpts.mean(axis=1),
+                                        side="right") - 1
+            part_idxs = np.clip(part_idxs, np.searchsorted(part_lines, line_idxs, side="left"),
+                                np.searchsorted(part_lines, line_idxs, side="right") - 1)
+            line_idxs = part_idxs
+            breakpts = breakpts - part_offsets[part_idxs][:, None]
+
+            # Extract coordinates (nodes) from geometries.
+            coords, node_lines = shapely.get_coordinates(geoms, include_z=shapely.has_z(geoms).any(),
+                                                         return_index=True)
+            node_counts = np.bincount(node_lines, minlength=len(geoms))
+            node_starts = np.concatenate([[0], np.cumsum(node_counts)[:-1]])
+
+            # Compile cumulative node measures (distance along each LineString).
+            steps = np.linalg.norm(np.diff(coords[:, :2], axis=0), axis=1)
+            steps = np.concatenate([[0], np.where(np.diff(node_lines) == 0, steps, 0)])
+            measures = np.cumsum(steps)
+            measures -= measures[node_starts][node_lines]
+
+            # Compile node search keys.
+            # Note: complex values are ordered by their real, then imaginary, components. Combining the LineString index
+            # (real) and node measure (imaginary) allows all LineStrings to be searched at once.
+            keys = node_lines + 1j * measures
+
+            def locate(measure: np.ndarray, side: str) -> np.ndarray:
+                """
+                Fetches the node indexes at which the given measures would be inserted into the nodes of each segment's
+                LineString, maintaining the order of the node measures.
+
+                :param np.ndarray measure: array of measures, one per segment.
+                :param str side: 'left' or 'right', the side on which to sort equal measures.
+                :return np.ndarray: array of node indexes.
+                """
+
+                return np.searchsorted(keys, line_idxs + 1j * measure, side=side)
+
+            def interpolate(measure: np.ndarray) -> np.ndarray:
+                """
+                Interpolates coordinates at the given measures along each segment's LineString.
+
+                :param np.ndarray measure: array of measures, one per segment.
+                :return np.ndarray: array of coordinates.
+                """
+
+                idx = np.clip(locate(measure, side="right") - 1, first_node, last_node - 1)
+                length = measures[idx + 1] - measures[idx]
+                ratio = np.divide(measure - measures[idx], length, out=np.zeros(len(idx)), where=length > 0)
+                ratio = np.clip(ratio, 0, 1)[:, None]
+                return coords[idx] + (ratio * (coords[idx + 1] - coords[idx]))
+
+            start, end = breakpts[:, 0], breakpts[:, 1]
+            first_node = node_starts[line_idxs]
+            last_node = first_node + node_counts[line_idxs] - 1
+
+            # Configure the index range for all nodes between breakpoints.
+            # Note: the range includes the last node before the first breakpoint and the first node after the last
+            # breakpoint.
+            from_idx = np.clip(locate(start, side="left") - 1, first_node, last_node - 1)
+            to_idx = np.clip(locate(end, side="right"), from_idx + 1, last_node)
+
+            # Remove nodes more than 1 unit outside the breakpoint range and flag breakpoints to be added as new nodes
+            # if no node exists within 1 unit.
+            flag = np.abs(start - measures[from_idx]) > 1
+            from_idx = from_idx + flag
+            add_start = flag & (np.abs(start - measures[from_idx]) > 1)
+
+            flag = np.abs(end - measures[to_idx]) > 1
+            to_idx = to_idx - flag
+            end_measure = np.where(to_idx >= from_idx, measures[np.maximum(to_idx, from_idx)],
+                                   np.where(add_start, start, np.inf))
+            add_end = flag & (np.abs(end - end_measure) > 1)
+
+            # Keep entire geometry if breakpoints cover entire length.
+            flag = (start == 0) & (np.round(end) == np.round(measures[last_node]))
+            from_idx[flag], to_idx[flag] = first_node[flag], last_node[flag]
+            add_start[flag], add_end[flag] = False, False
+
+            # If only 1 node remains, add both breakpoints as new nodes.
+            keep_counts = np.maximum(to_idx - from_idx + 1, 0)
+            flag = (add_start + keep_counts + add_end) == 1
+            add_start, add_end = add_start | flag, add_end | flag
+            counts = add_start + keep_counts + add_end
+
+            # Compile segmented coordinates.
+            offsets = np.concatenate([[0], np.cumsum(counts)[:-1]])
+            segment_coords = np.empty((counts.sum(), coords.shape[1]))
+            segment_coords[offsets[add_start]] = interpolate(start)[add_start]
+            segment_coords[(offsets + counts - 1)[add_end]] = interpolate(end)[add_end]
+
+            segments = np.repeat(np.arange(len(counts)), keep_counts)
+            positions = np.arange(len(segments)) - np.repeat(np.cumsum(keep_counts) - keep_counts, keep_counts)
+            segment_coords[offsets[segments] + add_start[segments] + positions] = coords[from_idx[segments] + positions]
+
+            return shapely.linestrings(segment_coords, indices=np.repeat(np.arange(len(counts)), counts))
+
+        def sort_multilinestring(con_id: Union[int, str], geom: MultiLineString) -> MultiLineString:
+            """
+            Sorts a MultiLineString into the correct LineString ordering based on calibration points.
+
+            :param Union[int, str] con_id: connection ID between the calibrations dataset and the base dataset.
+            :param MultiLineString geom: MultiLineString.
+            :return MultiLineString: sorted MultiLineString.
+            """
+
+            # Compile sorted calibration points for connection ID.
+            calibration_pts = calibrations_df.loc[calibrations_df[self.calibrations["id_field"]] == con_id] \
+                .sort_values(self.calibrations["measurement_field"])
+
+            # Get LineString index order by intersecting calibration points with LineStrings.
+            index_order = list(dict.fromkeys(chain.from_iterable(calibration_pts["geometry"].map(
+                lambda pt: [index for index, line in enumerate(geom.geoms) if pt.intersects(line)]).to_list())))
+
+            # Add missing indexes.
+            # Note: indexes will not be missing with topologically correct geometries, however, these errors have been
+            # identified in the data and it is preferred to accommodate them here and flag them collectively in the
+            # actual NRN pipeline.
+            missing = set(range(len(geom.geoms))) - set(index_order)
+            index_order.extend(missing)
+
+            # Create MultiLineString from LineString index ordering.
+            return MultiLineString([geom.geoms[index] for index in index_order])
+
+        logger.info("Assembling segmented network.")
+
+        # Assemble base - geometry connection.
+        logger.info(f"Assembling base - geometry connection: {self.base_dataset} - {self.geometry_dataset}.")
+
+        # Assemble datasets if they are not the same.
+        base = self.src_datasets[self.base_dataset].copy(deep=True)
+        if self.base_dataset != self.geometry_dataset:
+            base = gpd.GeoDataFrame(base.merge(self.src_datasets[self.geometry_dataset], how="left",
+                                               on=self.get_con_id_field(self.geometry_dataset)))
+
+        # Explode geometries to singlepart.
+        base = helpers.explode_geometry(base)
+        crs = base.crs
+
+        # Merge geometries for many-to-one links; keep only the first record but keep the entire merged geometry.
+        if self.geometry["merge"]:
+            logger.info("Merging geometries for many-to-one links.")
+
+            con_id_field = next(iter(self.structure["connections"]))
+            flag = base[con_id_field].duplicated(keep=False)
+            codes, con_ids = pd.factorize(base.loc[flag, con_id_field])
+            geom_links = dict(zip(con_ids, shapely.line_merge(shapely.multilinestrings(
+                base.loc[flag, "geometry"].to_numpy(), indices=codes))))
+
+            base = base.loc[~base[con_id_field].duplicated(keep="first")].copy(deep=True)
+            flag = base[con_id_field].isin(geom_links)
+            base.loc[flag, "geometry"] = base.loc[flag, con_id_field].map(geom_links)
+
+            # Sort MultiLineStrings into proper LineString ordering.
+            if self.calibrations:
+                logger.info(f"Sorting MultiLineStrings into proper LineString ordering.")
+
+                flag = base.geom_type == "MultiLineString"
+                base.loc[flag, "geometry"] = base.loc[flag, [con_id_field, "geometry"]].apply(
+                    lambda row: sort_multilinestring(*row), axis=1)
+
+        # Iterate datasets and assemble all event measurements for each base geometry.
+        # Note: breakpoints are compiled as a long-format table of base record indexes and measures.
+        logger.info(f"Compiling all event measurements as breakpoints.")
+
+        base = base.reset_index(drop=True)
+        breakpts = list()
+
+        for name, df in self.src_datasets.items():
+            if name not in {self.base_dataset, self.geometry_dataset} and {"from", "to"}.issubset(set(df.columns)):
+                logger.info(f"Compiling breakpoints for dataset: {name}.")
+
+                # Identify connection field.
+                con_id_field = self.get_con_id_field(name)
+
+                # Compile breakpoints as unique connection ID and measure combinations.
+                measures = pd.concat([df[[con_id_field, field]].set_axis([con_id_field, "measure"], axis=1)
+                                      for field in ("from", "to")], ignore_index=True).drop_duplicates()
+
+                # Link breakpoints to base records.
+                breakpts.append(base[[con_id_field]].rename_axis("line_idx").reset_index()
+                                .merge(measures, how="inner", on=con_id_field)[["line_idx", "measure"]])
+
+        # Reduce and sort breakpoints.
+        logger.info(f"Reducing and sorting breakpoints.")
+
+        breakpts = pd.concat(breakpts, ignore_index=True) if len(breakpts) else \
+            pd.DataFrame(columns=["line_idx", "measure"])
+        breakpts = breakpts.dropna().astype({"line_idx": int, "measure": float})\
+            .sort_values(by=["line_idx", "measure"]).drop_duplicates()
+
+        # Convert base dataset to DataFrame with individual geometries reprojected to the corresponding UTM zone.
+        if self.geometry["utm_zones"]:
+            logger.info("Reprojecting individual geometries to UTM zones.")
+
+            base = convert_to_individual_utm_zones(base)
+
+        # Filter breakpoints which are too close together.
+        logger.info(f"Filtering breakpoints which are too close together.")
+
+        # Filter breakpoints by keeping only those which are more than 1 unit distance from the next breakpoint.
+        diffs = breakpts["measure"].round().groupby(breakpts["line_idx"]).diff(-1)
+        breakpts = breakpts.loc[diffs.isna() | (diffs.abs() > 1)]
+
+        # Add geometry start- and endpoints (collectively referred to as endpoints), for all constituent LineStrings.
+        # Note: remove breakpoints which are within 1 unit distance from the endpoints.
+        logger.info(f"Adding geometry endpoints to breakpoints.")
+
+        # Compile the cumulative lengths of the constituent LineStrings of each geometry as endpoints.
+        parts, part_lines = shapely.get_parts(base["geometry"].to_numpy(), return_index=True)
+        part_ends = pd.Series(shapely.length(parts)).groupby(part_lines).cumsum().to_numpy()
+        part_firsts = np.concatenate([[True], part_lines[1:] != part_lines[:-1]])
+        part_starts = np.where(part_firsts, 0, np.concatenate([[0], part_ends[:-1]]))
+
+        # Remove breakpoints outside of the range (endpoints +/- 1 unit) of the LineString within which they fall.
+        # Note: complex values are ordered by their real, then imaginary, components.
+        line_idxs, measures = breakpts["line_idx"].to_numpy(), breakpts["measure"].to_numpy()
+        idx = np.searchsorted(part_lines + 1j * part_starts, line_idxs + 1j * measures, side="right") - 1
+        idx = np.clip(idx, 0, None)
+        flag = (part_lines[idx] == line_idxs) & (part_starts[idx] + 1 < measures) & (measures < part_ends[idx] - 1)
+
+        # Append endpoints to breakpoints and sort.
+        breakpts = pd.concat([breakpts.loc[flag],
+                              pd.DataFrame({"line_idx": part_lines[part_firsts], "measure": 0.0}),
+                              pd.DataFrame({"line_idx": part_lines, "measure": part_ends})], ignore_index=True)\
+            .sort_values(by=["line_idx", "measure"], kind="stable")
+
+        # Split record geometries on breakpoints.
+        logger.info(f"Splitting records on geometry breakpoints.")
+
+        # Nest breakpoints into consecutive pairs for each geometry.
+        line_idxs, measures = breakpts["line_idx"].to_numpy(), breakpts["measure"].to_numpy()
+        flag = line_idxs[:-1] == line_idxs[1:]
+        line_idxs, breakpts = line_idxs[:-1][flag], np.column_stack([measures[:-1][flag], measures[1:][flag]])
+
+        # Explode dataframe on breakpoint pairs, retaining the original geometry index.
+        geoms = base["geometry"].to_numpy()
+        base = pd.DataFrame(base).iloc[line_idxs].reset_index(drop=True)
+        base[["breakpt_from", "breakpt_to"]] = breakpts
+
+        # Extract geometry segment corresponding to breakpoints.
+        base["geometry"] = segment_geometries(geoms, line_idxs, breakpts)
+
+        # Restore GeoDataFrame for geometries with a common CRS.
+        if not self.geometry["utm_zones"]:
+            base = gpd.GeoDataFrame(base, geometry="geometry", crs=crs)
+
+        # Store result.
+        self.nrn_datasets["roadseg"] = base.copy(deep=True)
+
+    def clean_event_measurements(self) -> pd.DataFrame:
+        """
+        Performs several cleanup operations on records based on event measurement:
+        1. Simplifies event measurement field names to 'from' and 'to'.
+        2. Converts measurements to crs unit, according to the configured factor.
+        3. Swaps measurement order or drops records with invalid measurements (from > to), as configured.
+        4. Matches event measurements to any corresponding calibration point measurements (for improved accuracy), if
+        calibrations are configured.
+        5. Removes event measurement offsets for out-of-scope records, if calibrations are configured: some records do
+        not start at zero because they begin outside of the province / territory. The event measurements on these
+        records must be reduced according to the starting offset.
+        6. Repairs gaps in event measurements along the same connected feature.
+        7. Reports overlapping event measurements along the same connected feature.
+
+        :return pd.DataFrame: DataFrame of overlapping event measurements (dataset, con_id, from, to, overlap_to), where
+            overlap_to is the maximum 'to' measurement of all preceding records along the same connected feature.
+        """
+
+        logger.info("Cleaning event measurement fields.")
+
+        # Compile calibration points and offsets for event measurements.
+        calibrations_df = None
+        offsets = pd.Series(dtype=float)
+        if self.calibrations:
+            id_field, measurement_field = itemgetter("id_field", "measurement_field")(self.calibrations)
+
+            # Convert calibration point measurement units identically to event measurements.
+            calibrations_df = self.src_datasets[self.calibrations["dataset"]]
+            calibrations_df[measurement_field] = calibrations_df[measurement_field].multiply(
+                self.event_measurement_factor)
+
+            # Compile offsets for out-of-scope events.
+            offsets = calibrations_df.loc[calibrations_df[id_field].isin(self.calibrations["ids"])]\
+                .groupby(by=id_field)[measurement_field].min()
+
+            # Compile sorted calibration point measurements.
+            calibrations_df = calibrations_df.loc[~calibrations_df[measurement_field].isna(),
+                                                  [id_field, measurement_field]].sort_values(by=measurement_field)
+
+        # Iterate dataframes with event measurement fields.
+        fields = self.event_measurement_fields
+        overlaps = list()
+
+        for layer, df in self.src_datasets.items():
+            if set(fields.values()).issubset(df.columns):
+
+                logger.info(f"Cleaning event measurements for dataset: {layer}.")
+
+                # Identify connection field.
+                con_id_field = self.get_con_id_field(layer)
+
+                # Convert measurements.
+                logger.info("Converting event measurements.")
+
+                if self.event_measurement_factor != 1:
+                    df[list(fields.values())] = df[list(fields.values())].multiply(self.event_measurement_factor)
+                df.rename(columns={fields["from"]: "from", fields["to"]: "to"}, inplace=True)
+
+                # Remove records with invalid event measurements.
+                if self.invalid_event_measurements == "drop":
+                    logger.info("Removing records with invalid event measurements.")
+
+                    count = len(df)
+                    df = df.loc[df["from"] < df["to"]].copy(deep=True)
+                    logger.info(f"Dropped {count - len(df)} of {count} records.")
+
+                # Swap measurement order for records with invalid event measurements.
+                else:
+                    logger.info("Swapping measurement order for records with invalid event measurements.")
+
+                    flag = pd.Series(df["from"] > df["to"])
+                    df.loc[flag, ["from", "to"]] = df.loc[flag, ["to", "from"]].values
+                    logger.info(f"Swapped {sum(flag)} of {len(df)} records.")
+
+                # Match event measurements to calibration points, if possible.
+                if calibrations_df is not None:
+                    logger.info(f"Matching event measurements against calibration points.")
+
+                    count = 0
+                    for fld in ("from", "to"):
+
+                        # Identify the nearest calibration point measurement for each event (tolerance = 1 unit).
+                        events = df.loc[df[fld] != 0, [con_id_field, fld]].rename_axis("index").reset_index()\
+                            .sort_values(by=fld)
+                        matches = pd.merge_asof(events, calibrations_df.rename(columns={id_field: con_id_field}),
+                                                left_on=fld, right_on=measurement_field, by=con_id_field,
+                                                direction="nearest", tolerance=1)
+                        matches = matches.loc[~matches[measurement_field].isna() &
+                                              (matches[measurement_field] != matches[fld])]
+
+                        # Update records.
+                        df.loc[matches["index"], fld] = matches[measurement_field].values
+                        count += len(matches)
+
+                    logger.info(f"Matched {count} event measurements to calibration points.")
+
+                # Update out-of-scope offsets.
+                if len(offsets):
+                    logger.info("Updating out-of-scope offsets for events measurements.")
+
+                    df_offsets = df[con_id_field].map(offsets)
+                    flag = ~df_offsets.isna()
+                    df.loc[flag, ["from", "to"]] = df.loc[flag, ["from", "to"]].subtract(df_offsets.loc[flag], axis=0)
+
+                    logger.info(f"Updated {sum(flag)} offset event measurements for {con_id_field} values: "
+                                f"{', '.join(map(str, offsets.index))}.")
+
+                # Repair gaps in measurement ranges.
+                logger.info("Repairing event measurement gaps.")
+
+                # Sort records by connection ID and event measurements and compile, for each record, the maximum 'to'
+                # measurement of all preceding records along the same connected feature.
+                records = df.sort_values(by=[con_id_field, "from", "to"], kind="stable")
+                prev_to = records.groupby(by=con_id_field, sort=False)["to"].cummax()\
+                    .groupby(records[con_id_field], sort=False).shift(1)
+
+                # For any gaps (tolerance = 1 unit), reduce the 'from' measurement to the preceding 'to' measurement.
+                flag = (records["from"] - prev_to).between(0, 1, inclusive="right")
+                records.loc[flag, "from"] = prev_to.loc[flag]
+                df.loc[flag.loc[flag].index, "from"] = prev_to.loc[flag]
+
+                logger.info(f"Repaired {sum(flag)} event measurement gaps.")
+
+                # Flag overlapping measurement ranges.
+                logger.info("Identifying overlapping event measurement ranges.")
+
+                flag = records["from"] < prev_to
+                if sum(flag):
+                    logger.warning(f"Overlaps detected: {sum(flag)} records across "
+                                   f"{records.loc[flag, con_id_field].nunique()} {con_id_field} values.")
+
+                    # Compile overlapping records.
+                    overlaps.append(records.loc[flag, [con_id_field, "from", "to"]]
+                                    .rename(columns={con_id_field: "con_id"})
+                                    .assign(dataset=layer, overlap_to=prev_to.loc[flag]))
+
+                # Store results.
+                self.src_datasets[layer] = df.copy(deep=True)
+
+        # Compile overlap report.
+        columns = ["dataset", "con_id", "from", "to", "overlap_to"]
+        return pd.concat(overlaps, ignore_index=True)[columns] if len(overlaps) else pd.DataFrame(columns=columns)
+
+    def compile_source_datasets(self) -> None:
+        """
+        Loads raw source layers into (Geo)DataFrames. Layers are read concurrently via Arrow, loading only the required
+        fields and applying queries as attribute filters, where possible. Geometries are only read for spatial datasets.
+        """
+
+        def load_layer(layer: str, attr: dict) -> Union[gpd.GeoDataFrame, pd.DataFrame]:
+            """
+            Loads a raw source layer into a (Geo)DataFrame.
+
+            :param str layer: layer name.
+            :param dict attr: layer import specifications.
+            :return Union[gpd.GeoDataFrame, pd.DataFrame]: (Geo)DataFrame.
+            """
+
+            logger.info(f"Compiling source dataset: {layer}.")
+
+            # Compile required fields, matching lowercase field names.
+            info = pyogrio.read_info(self.src, layer=layers_lower[layer])
+            columns = [field for field in info["fields"] if field.lower() in attr["fields"]]
+            spatial = ("geometry" in attr["fields"]) and (info["geometry_type"] is not None)
+
+            # Translate query into an attribute filter, if possible.
+            where = helpers.translate_query(attr["query"]) if attr["query"] else None
+
+            # Load layer into dataframe, force lowercase column names.
+            df = pyogrio.read_dataframe(self.src, layer=layers_lower[layer], columns=columns, read_geometry=spatial,
+                                        where=where, use_arrow=True)
+            df.columns = map(str.lower, df.columns)
+
+            # Filter records with query, if the query could not be applied as an attribute filter.
+            if attr["query"]:
+                if not where:
+                    try:
+                        df.query(attr["query"], inplace=True)
+                    except ValueError as e:
+                        raise ValueError(f"Invalid query: \"{attr['query']}\".") from e
+
+                count = info["features"]
+                logger.info(f"Dropped {count - len(df)} of {count} records for dataset: {layer}, based on query.")
+
+            # Update column names to match NRN.
+            df.rename(columns=self.rename, inplace=True)
+
+            # Convert tabular dataframes.
+            if ("geometry" not in df.columns) or (not df["geometry"].iloc[0]):
+                df = pd.DataFrame(df[df.columns.difference(["geometry"])])
+
+            return df
+
+        logger.info(f"Compiling source datasets from: {self.src}.")
+
+        try:
+
+            # Compile layer names for lowercase lookup.
+            layers_lower = {name.lower(): name for name in pyogrio.list_layers(self.src)[:, 0]}
+
+            # Validate layers.
+            missing = set(self.schema) - set(layers_lower)
+            if missing:
+                raise ValueError(f"Missing source layer(s): {', '.join(sorted(missing))}.")
+
+            # Load layers concurrently and store results.
+            with ThreadPoolExecutor() as executor:
+                for layer, df in zip(self.schema, executor.map(load_layer, self.schema, self.schema.values())):
+                    self.src_datasets[layer] = df.copy(deep=True)
+
+        except (pyogrio.errors.DataLayerError, pyogrio.errors.DataSourceError, pyogrio.errors.FieldError,
+                ValueError) as e:
+            logger.exception(f"Unable to compile source datasets.")
+            logger.exception(e)
+            sys.exit(1)
+
+    def configure_valid_records(self) -> None:
+        """
+        Filters records to only those which link to the base dataset, non-matching datasets are removed.
+        Flags many-to-one linkages between the base and geometry datasets.
+        """
+
+        logger.info(f"Configuring valid records.")
+
+        # Iterate dataframes and remove records which do not link to the base dataset.
+        for name, df in {k: v for k, v in self.src_datasets.items() if k != self.base_dataset}.items():
+
+            logger.info(f"Configuring valid records for source dataset: {name}.")
+
+            # Identify connection field.
+            con_id_field = self.get_con_id_field(name)
+
+            # Compile valid IDs from base dataset for the identified connection field.
+            valid_ids = set(self.src_datasets[self.base_dataset][con_id_field])
+
+            # Remove records with invalid connection IDs.
+            df_valid = df.loc[df[con_id_field].isin(valid_ids)]
+            logger.info(f"Dropped {len(df) - len(df_valid)} of {len(df)} records for dataset: {name}, based on ID "
+                        f"field: {con_id_field}.")
+
+            # Flag many-to-one linkages between base and geometry datasets, if they are not the same.
+            if (name == self.geometry_dataset) and (self.base_dataset != self.geometry_dataset):
+
+                # Compile and flag many-to-one linkages.
+                base = self.src_datasets[self.base_dataset]
+                for con_id, count in Counter(base.loc[base[con_id_field].duplicated(keep=False), con_id_field]).items():
+                    logger.warning(f"Many-to-one linkage identified between base ({self.base_dataset}) and geometry "
+                                   f"({self.geometry_dataset}) datasets: {con_id_field}={con_id}, count={count}.")
+
+            # Store or remove dataset.
+            if len(df_valid):
+                self.src_datasets[name] = df_valid.copy(deep=True)
+            else:
+                del self.src_datasets[name]
+                if name in self.point_datasets:
+                    del self.point_datasets[name]
+                self.structure["connections"][con_id_field].remove(name)
+
+    def create_point_datasets(self) -> None:
+        """
+        Create point datasets from the segmented base geometry dataset and point measurement values. Each point is
+        placed on the segment whose breakpoint (event measurement) range contains the point measurement.
+        """
+
+        logger.info("Creating point datasets.")
+
+        # Compile roadseg dataset and segment breakpoints.
+        base = self.nrn_datasets["roadseg"]
+        breakpts = base[["breakpt_from", "breakpt_to"]].to_numpy(dtype=float)
+        geoms = base["geometry"].to_numpy()
+
+        # Iterate source datasets to be converted into points.
+        for point_dataset, nrn_dataset in self.point_datasets.items():
+            point_df = self.src_datasets[point_dataset].reset_index(drop=True)
+
+            logger.info(f"Creating point dataset: {nrn_dataset}.")
+
+            # Identify connection field.
+            con_id_field = self.get_con_id_field(point_dataset)
+
+            # Configure required fields from base.
+            base_fields = ["epsg", "geometry"] if self.geometry["utm_zones"] else ["geometry"]
+            if "base_output_fields" in self.schema[point_dataset]:
+                base_fields.extend(self.schema[point_dataset]["base_output_fields"])
+
+            # Compile segment search keys, sorted by connection ID and starting breakpoint.
+            # Note: complex values are ordered by their real, then imaginary, components. Combining the connection ID
+            # code (real) and starting breakpoint (imaginary) allows all connection IDs to be searched at once.
+            con_ids = pd.Index(base[con_id_field].unique())
+            codes = con_ids.get_indexer(base[con_id_field])
+            order = np.lexsort((breakpts[:, 0], codes))
+            keys = codes[order] + 1j * breakpts[order, 0]
+
+            # Identify, for each point, the last segment of the connected feature which starts at or before the point
+            # measurement. Points preceding the first segment are assigned to the first segment.
+            point_codes = con_ids.get_indexer(point_df[con_id_field])
+            measures = point_df[self.point_event_measurement_field].to_numpy(dtype=float)
+            flag = point_codes >= 0
+            idx = np.maximum(np.searchsorted(keys, point_codes + 1j * measures, side="right") - 1,
+                             np.searchsorted(codes[order], point_codes, side="left"))
+            segment_idxs = order[idx[flag]]
+
+            # Merge point dataframe with the attributes of the identified segments.
+            segments = pd.DataFrame(base[base_fields]).iloc[segment_idxs].set_axis(np.flatnonzero(flag), axis=0)
+            point_df = point_df.join(segments, how="left")
+
+            # Interpolate points along the identified segments, relative to the starting breakpoint.
+            point_df["geometry"] = None
+            point_df.loc[flag, "geometry"] = shapely.line_interpolate_point(
+                geoms[segment_idxs], measures[flag] - breakpts[segment_idxs, 0])
+
+            # Store point dataset, as a GeoDataFrame for geometries with a common CRS.
+            if not self.geometry["utm_zones"]:
+                point_df = gpd.GeoDataFrame(point_df, geometry="geometry", crs=base.crs)
+            self.nrn_datasets[nrn_dataset] = point_df.copy(deep=True)
+
+        # Remove breakpoints and connection ID fields, excluding output fields, from roadseg dataset.
+        output_fields = set(chain.from_iterable(props["output_fields"] for props in self.schema.values() if
+                                                props["output_fields"]))
+        cols_drop = {"breakpt_from", "breakpt_to", *set(self.structure["connections"]) - output_fields}
+        self.nrn_datasets["roadseg"] = base.drop(columns=cols_drop & set(base.columns))
+
+    def export_gpkg(self) -> None:
+        """Exports the NRN datasets to a GeoPackage."""
+
+        logger.info("Exporting datasets to GeoPackage.")
+
+        # Iterate datasets.
+        for table, df in self.nrn_datasets.items():
+
+            # Conditionally explode geometries.
+            geom_types = set(df.geom_type)
+            if any(geom_type in geom_types for geom_type in {"MultiPoint", "MultiLineString"}):
+                self.nrn_datasets[table] = helpers.explode_geometry(df).copy(deep=True)
+
+        # Export to GeoPackage.
+        helpers.export(self.nrn_datasets, self.dst, merge_schemas=True)
+
+    def get_con_id_field(self, name: str) -> str:
+        """
+        Fetches the connection ID field, relative to the base dataset, for the given dataset name.
+
+        :param str name: dataset name.
+        :return str: connection ID field, relative to the base dataset.
+        """
+
+        for con_field, df_names in self.structure["connections"].items():
+            if name in df_names:
+                return con_field
+
+    def process_partition(self) -> None:
+        """
+        Applies all operations which are local to a connected feature: event measurement cleanup, network segmentation,
+        network attribution, and point dataset creation.
+        """
+
+        self.event_overlaps = self.clean_event_measurements()
+        self.assemble_segmented_network()
+        self.assemble_network_attribution()
+        self.create_point_datasets()
+
+    def process_partitions(self) -> None:
+        """
+        Hash-partitions the source datasets by connection ID and processes each partition independently, concurrently if
+        multiple processes are configured. Partition results are concatenated into the NRN datasets.
+        """
+
+        # Process source datasets as a single partition.
+        if self.partitions == 1:
+            self.process_partition()
+            return
+
+        # Validate partition key.
+        # Note: partitions must keep all records of a connected feature together, requiring a single connection field.
+        if len(self.structure["connections"]) > 1:
+            logger.warning(f"Unable to partition source datasets with multiple connection fields: "
+                           f"{', '.join(self.structure['connections'])}. Processing as a single partition.")
+            self.process_partition()
+            return
+
+        logger.info(f"Partitioning source datasets into {self.partitions} partitions by connection ID.")
+
+        # Assign each connection ID of the base dataset to a partition by hash value.
+        con_id_field = next(iter(self.structure["connections"]))
+        con_ids = pd.Index(self.src_datasets[self.base_dataset][con_id_field].unique())
+        con_id_partitions = pd.util.hash_array(con_ids.to_numpy()) % self.partitions
+
+        # Compile the partition index of every source record.
+        # Note: records are matched to the base connection IDs by lookup, rather than hashed directly, such that
+        # differing connection ID dtypes between datasets resolve to the same partition.
+        self.partition_indexes = {name: con_id_partitions[con_ids.get_indexer(df[con_id_field])]
+                                  for name, df in self.src_datasets.items()}
+
+        # Process non-empty partitions.
+        # Note: the LRS instance is handed to each worker once, as a fork-inherited snapshot where supported. Only the
+        # partition results are returned to the main process.
+        indexes = sorted(set(self.partition_indexes[self.base_dataset]))
+        if self.processes > 1 and len(indexes) > 1:
+
+            context = mp.get_context("fork" if "fork" in mp.get_all_start_methods() else None)
+            try:
+                with context.Pool(processes=min(self.processes, len(indexes)), initializer=_init_worker,
+                                  initargs=(self,)) as pool:
+                    results = pool.map(_run_partition, indexes)
+
+            except RuntimeError as e:
+                logger.exception(e)
+                sys.exit(1)
+
+        else:
+            results = list(map(self.run_partition, indexes))
+
+        # Concatenate partition results.
+        logger.info(f"Concatenating results of {len(indexes)} partitions.")
+
+        nrn_datasets, event_overlaps = zip(*results)
+        for name in nrn_datasets[0]:
+            self.nrn_datasets[name] = pd.concat([datasets[name] for datasets in nrn_datasets], ignore_index=True)
+        self.event_overlaps = pd.concat(event_overlaps, ignore_index=True)
+
+    def run_partition(self, index: int) -> Tuple[Dict[str, Union[gpd.GeoDataFrame, pd.DataFrame]], pd.DataFrame]:
+        """
+        Processes a single connection ID partition of the source datasets.
+
+        :param int index: partition index.
+        :return Tuple[Dict[str, Union[gpd.GeoDataFrame, pd.DataFrame]], pd.DataFrame]: dictionary of NRN dataset names
+            and (Geo)DataFrames and DataFrame of overlapping event measurements for the partition.
+        """
+
+        logger.info(f"Processing partition {index + 1} of {self.partitions}.")
+
+        # Compile the partition as an independent copy of the LRS instance.
+        lrs = copy(self)
+        lrs.src_datasets = {name: df.loc[self.partition_indexes[name] == index].copy(deep=True)
+                            for name, df in self.src_datasets.items()}
+        lrs.nrn_datasets = dict()
+
+        # Process partition.
+        lrs.process_partition()
+
+        return lrs.nrn_datasets, lrs.event_overlaps
+
+    def separate_composite_datasets(self) -> None:
+        """Separates specified datasets into multiple datasets."""
+
+        logger.info("Separating composite datasets.")
+
+        # Iterate composite datasets.
+        for composite_name in self.composite_datasets:
+            composite_df = self.src_datasets[composite_name]
+            con_id_field = self.get_con_id_field(composite_name)
+            count = len(composite_df)
+
+            # Iterate composite new datasets.
+            for new_dataset in self.composite_datasets[composite_name]["new_datasets"]:
+
+                # Compile new dataset properties.
+                dataset_name, query, rename_fields, output_fields = itemgetter(
+                    "dataset_name", "query", "rename_fields", "output_fields")(new_dataset)
+
+                logger.info(f"Separating records from composite dataset: \"{composite_name}\" into new dataset: "
+                            f"\"{dataset_name}\".")
+
+                # Create new dataset via dataframe query.
+                new_df = composite_df.query(query)
+
+                # Log new record count.
+                logger.info(f"New dataset: \"{dataset_name}\" contains {len(new_df)} / {count} composite dataset "
+                            f"records.")
+
+                # Store new dataset with renamed fields and add to class variables: schema and structure.
+                # Note: updating these class variables avoids having to implement specific logic purely to handle
+                # composite new datasets.
+                self.src_datasets[dataset_name] = new_df.rename(columns=rename_fields).copy(deep=True)
+                self.schema[dataset_name] = {"output_fields": output_fields}
+                self.structure["connections"][con_id_field].append(dataset_name)
+
+                # Filter composite dataframe to all remaining records, if queries are to be applied successively.
+                if self.composite_datasets[composite_name]["successive_queries"]:
+                    composite_df = composite_df.query(f"~({query})").copy(deep=True)
+
+            # Remove original composite dataset and remove from class variables: schema, point datasets, and structure.
+            del self.src_datasets[composite_name]
+            if composite_name in self.point_datasets:
+                del self.point_datasets[composite_name]
+            del self.schema[composite_name]
+            self.structure["connections"][con_id_field].remove(composite_name)
+
+    def separate_final_datasets(self):
+        """Separates the final NRN datasets into multiple NRN datasets based on queries."""
+
+        logger.info(f"Separating final NRN datasets.")
+
+        # Iterate NRN datasets to be separated.
+        for nrn_dataset, new_datasets in self.final_dataset_separations.items():
+            logger.info(f"Separating NRN dataset: \"{nrn_dataset}\".")
+            nrn_df = self.nrn_datasets[nrn_dataset]
+
+            # Iterate new dataset parameters and store resulting dataframe.
+            for new_dataset in new_datasets:
+                name, query = itemgetter("dataset_name", "query")(new_dataset)
+                self.nrn_datasets[name] = nrn_df.query(query).copy(deep=True)
+
+                logger.info(f"Separated {len(self.nrn_datasets[name])} records from \"{nrn_dataset}\" to create NRN "
+                            f"dataset \"{name}\".")
+
+    def split_at_intersections(self) -> None:
+        """
+        Splits geometries at nodes, excluding start and endpoints, which are shared by one or more other geometries.
+        Intersections without a common node will not be split since it is impossible to determine whether the geometries
+        actually intersect or just cross at different elevations.
+        """
+
+        def split_geometry_indexes(geom: LineString, indexes: List[int]) -> List[LineString]:
+            """
+            Splits a LineString at the given node indexes.
+
+            :param LineString geom: LineString.
+            :param List[int] indexes: list of node indexes at which the LineString will be split.
+            :return List[LineString]: list of LineStrings, segemented from the original geometry.
+            """
+
+            # Compile LineString coordinates as splitting Points.
+            nodes = list(map(Point, attrgetter("coords")(geom)))
+
+            # Add start and end to indexes and create ordered pairs.
+            indexes = [0, *indexes, len(nodes)-1]
+            indexes = [[indexes[idx], indexes[idx+1]] for idx in range(len(indexes)-1)]
+
+            # Generate LineStrings from node index ranges.
+            return [LineString(nodes[idx_rng[0]: idx_rng[-1]+1]) for idx_rng in indexes]
+
+        logger.info(f"Splitting geometries at intersections.")
+
+        roads = self.nrn_datasets["roadseg"].copy(deep=True)
+
+        # Explode MultiLineStrings.
+        roads = helpers.explode_geometry(roads).copy(deep=True)
+
+        # Extract and explode LineStrings to points, filter to only duplicates.
+        pts = roads["geometry"].map(attrgetter("coords")).map(tuple).explode()
+        pts_dups = set(pts.loc[pts.duplicated(keep=False)])
+
+        # For each LineString, excluding endpoints, compile the point indexes which are duplicated.
+        # Note: it does not matter whether the point is duplicated by another LineString or by the same LineString, the
+        # geometry should be split regardless.
+        roads["node_idxs"] = roads["geometry"].map(
+            lambda g: [index + 1 for index, pt in enumerate(tuple(attrgetter("coords")(g))[1:-1]) if pt in pts_dups])
+
+        # Split segments at node indexes.
+        split_flag = roads["node_idxs"].map(len) > 0
+        args = roads.loc[split_flag, ["geometry", "node_idxs"]].apply(lambda row: [*row], axis=1)
+
+        roads_crs = roads.crs
+        roads = pd.DataFrame(roads)
+        roads["geometry"] = roads["geometry"].map(lambda g: [g])
+
+        roads.loc[split_flag, "geometry"] = args.map(lambda vals: split_geometry_indexes(*vals))
+        logger.info(f"Split {len(args)} records into {sum(roads.loc[split_flag, 'node_idxs'].map(len)+1)} records.")
+
+        # Explode segmented records.
+        roads = gpd.GeoDataFrame(roads.explode("geometry", ignore_index=True), crs=roads_crs)
+
+        # Drop excess fields.
+        roads.drop(columns=["node_idxs"], inplace=True)
+
+        # Store result.
+        self.nrn_datasets["roadseg"] = roads.copy(deep=True)
+
+    def standardize_projections(self):
+        """Standardizes multi-CRS DataFrames to a GeoDataFrame with NRN standard projection EPSG:4617."""
+
+        logger.info("Standardizing dataset projections.")
+
+        # Iterate NRN datasets.
+        for table, df in self.nrn_datasets.items():
+            if {"epsg", "geometry"}.issubset(set(df.columns)):
+
+                logger.info(f"Standardizing dataset projection for: \"{table}\".")
+
+                # Reproject records from their individual CRS to EPSG:4617.
+                geoms = self.transform_utm_zones(df["geometry"].to_numpy(), df["epsg"].to_numpy(), crs="EPSG:4617",
+                                                 inverse=True)
+
+                # Store results as a GeoDataFrame.
+                self.nrn_datasets[table] = gpd.GeoDataFrame(df.drop(columns=["epsg", "geometry"]), geometry=geoms,
+                                                            crs="EPSG:4617")
+
+    @staticmethod
+    def transform_utm_zones(geoms: np.ndarray, epsgs: np.ndarray, crs: str, inverse: bool = False) -> np.ndarray:
+        """
+        Reprojects geometries between a common CRS and the UTM zone of each geometry. The coordinates of each UTM zone
+        are transformed as a single array, with UTM zones transformed concurrently.
+
+        :param np.ndarray geoms: array of geometries.
+        :param np.ndarray epsgs: array of UTM zone EPSG codes, one per geometry.
+        :param str crs: common CRS.
+        :param bool inverse: reproject geometries from their UTM zones to the common CRS, default False.
+        :return np.ndarray: array of reprojected geometries.
+        """
+
+        def transform_zone(epsg: int) -> Tuple[np.ndarray, np.ndarray]:
+            """
+            Reprojects the geometries of a single UTM zone.
+
+            :param int epsg: UTM zone EPSG code.
+            :return Tuple[np.ndarray, np.ndarray]: boolean array of UTM zone records and array of reprojected
+                geometries.
+            """
+
+            flag = epsgs == epsg
+            transformer = get_transformer(*((f"EPSG:{epsg}", crs) if inverse else (crs, f"EPSG:{epsg}")))
+
+            return flag, shapely.transform(
+                geoms[flag], lambda coords: np.column_stack(transformer.transform(*coords.T)), include_z=include_z)
+
+        include_z = bool(shapely.has_z(geoms).any())
+        epsgs = pd.Series(epsgs)
+        geoms_reprojected = np.array(geoms, dtype=object)
+
+        # Reproject geometries of each UTM zone.
+        with ThreadPoolExecutor() as executor:
+            for flag, zone_geoms in executor.map(transform_zone, map(int, epsgs.dropna().unique())):
+                geoms_reprojected[flag] = zone_geoms
+
+        return geoms_reprojected
+
+
+@click.command()
+@click.argument("source", type=click.Choice(sorted(path.stem for path in (filepath.parent / "schemas").glob("*.yaml")),
+                                            case_sensitive=False))
+@click.argument("src", type=click.Path(exists=True, file_okay=False, dir_okay=True, resolve_path=True, path_type=Path))
+@click.argument("dst", type=click.Path(exists=False, file_okay=True, dir_okay=False, resolve_path=True, path_type=Path))
+@click.option("-p", "--processes", type=click.INT, default=1, show_default=True,
+              help="Number of worker processes used to process connection ID partitions concurrently.")
+@click.option("-n", "--partitions", type=click.INT, default=None,
+              help="Number of connection ID partitions into which the source datasets are split. Defaults to the "
+                   "number of processes.")
+def main(source: str, src: Path, dst: Path, processes: int = 1, partitions: Union[None, int] = None) -> None:
+    """
+    Executes the LRS class.
+
+    \b
+    :param str source: abbreviation for the source province / territory.
+    :param Union[Path, str] src: Path to an input File GeoDatabase (.gdb).
+    :param Union[Path, str] dst: Path to an output GeoPackage (.gpkg).
+    :param int processes: number of worker processes used to process connection ID partitions concurrently, default 1.
+    :param Union[None, int] partitions: number of connection ID partitions into which the source datasets are split,
+        default None (equal to the number of processes).
+    """
+
+    try:
+
+        @helpers.timer
+        def run():
+            lrs = LRS(source, src, dst, processes, partitions)
+            lrs()
+
+        run()
+
+    except KeyboardInterrupt:
+        logger.exception("KeyboardInterrupt: Exiting program.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+
+    # GUI
+    if sys.argv[-1] == "--gui":
+        from utils.gui import gui
+        main(args=gui(main, calling_script=Path(__file__).resolve()))
+
+    # CLI
+    else:
+        main()
@@ -1,6 +1,10 @@
+import ast
 import click
+import geopandas as gpd
 import jinja2
 import logging
+import numpy as np
+import pandas as pd
 import re
 import sys
 import yaml
@@ -8,14 +12,14 @@ import zipfile
 from datetime import datetime
 from operator import itemgetter
 from pathlib import Path
+from tabulate import tabulate
 from tqdm import tqdm
 from tqdm.auto import trange
-from typing import Union
+from typing import Any, Dict, Union
 
 filepath = Path(__file__).resolve()
 sys.path.insert(1, filepath.parents[1].as_posix())
 from utils import helpers
-from utils.gui import gui
 
 
 # Set logger.
@@ -30,11 +34,14 @@ logger.addHandler(handler)
 class Export:
     """Defines an NRN process."""
 
-    def __init__(self, source: str) -> None:
+    def __init__(self, source: str, dframes: Union[None, Dict[str, Union[gpd.GeoDataFrame, pd.DataFrame]]] = None) \
+            -> None:
         """
         Initializes an NRN process.
 
         :param str source: abbreviation for the source province / territory.
+        :param Union[None, Dict[str, Union[gpd.GeoDataFrame, pd.DataFrame]]] dframes: optional dictionary of NRN dataset
+            names and (Geo)DataFrames to process instead of loading the interim GeoPackage, default None.
         """
 
         self.source = source.lower()
@@ -46,7 +53,7 @@ class Export:
         self.dst = filepath.parents[2] / f"data/processed/{self.source}"
 
         # Validate source path.
-        if not self.src.exists():
+        if dframes is None and not self.src.exists():
             logger.exception(f"Input data not found: {self.src}.")
             sys.exit(1)
 
@@ -73,7 +80,7 @@ class Export:
         self.bar_format = "{desc}: |{bar}| {percentage:3.0f}% {r_bar}"
 
         # Load data.
-        self.dframes = helpers.load_gpkg(self.src)
+        self.dframes = helpers.load_gpkg(self.src) if dframes is None else dframes
 
     def __call__(self) -> None:
         """Executes an NRN process."""
@@ -137,7 +144,7 @@ class Export:
                 export_specs = self.distribution_formats[lang][frmt]
 
                 # Filter required dataframes.
-                dframes = {name: df.copy(deep=True) for name, df in dfs.items() if name in export_specs["conform"]}
+                dframes = {name: df for name, df in dfs.items() if name in export_specs["conform"]}
 
                 # Configure export directory.
                 export_dir, export_file = itemgetter("dir", "file")(export_specs["data"])
@@ -188,14 +195,46 @@ class Export:
         """
         Generate French equivalents of all NRN datasets.
         Note: Only the data values are updated, not the column names.
+        Note: French dataframes share all columns with the English dataframes, only translated columns are replaced.
         """
 
+        def _translate(val: Any, lookup: Union[dict, None], domain: bool, default_en: Any, default_fr: Any) -> Any:
+            """
+            Translates a single value, equivalent to :func:`helpers.apply_domain` followed by the translation of default
+            values.
+
+            :param Any val: value.
+            :param Union[dict, None] lookup: lowercase domain lookup dictionary, if any.
+            :param bool domain: indicates if the field has a domain.
+            :param Any default_en: English default value.
+            :param Any default_fr: French default value.
+            :return Any: translated value.
+            """
+
+            # Translate domain values.
+            if isinstance(lookup, dict):
+                val = lookup.get(str(val).lower(), default_fr)
+            elif domain and (pd.isna(val) or str(val) in {"", "nan", "-2147483648", "-2147483648.0"}):
+                val = default_fr
+
+            # Translate default values.
+            if not pd.isna(val) and val == default_en:
+                val = default_fr
+
+            return val
+
         logger.info("Generating French dataframes.")
 
+        # Compile lowercase domain lookups.
+        lookups = {table: {field: {str(k).lower(): v for k, v in domain["lookup"].items()}
+                           if isinstance(domain["lookup"], dict) else None for field, domain in domains.items()}
+                   for table, domains in self.domains.items()}
+
         # Reconfigure dataframes dict to hold English and French data.
+        # Note: French dataframes are shallow copies which share all data with the English dataframes.
         self.dframes = {
-            "en": {table: df.copy(deep=True) for table, df in self.dframes.items()},
-            "fr": {table: df.copy(deep=True) for table, df in self.dframes.items()}
+            "en": self.dframes,
+            "fr": {table: df.copy(deep=False) for table, df in self.dframes.items()}
         }
 
         # Iterate dataframes and fields.
@@ -206,63 +245,101 @@ class Export:
 
                 try:
 
-                    series = df[field].copy(deep=True)
-
-                    # Translate domain values.
-                    if field in self.domains[table]:
-                        series = helpers.apply_domain(series, self.domains[table][field]["lookup"],
-                                                      self.defaults["fr"][table][field])
+                    # Factorize series into integer codes and unique values.
+                    codes, uniques = pd.factorize(df[field], use_na_sentinel=False)
 
-                    # Translate default values and Nones.
-                    series.loc[series == self.defaults["en"][table][field]] = self.defaults["fr"][table][field]
-                    if "None" in series:
-                        series.loc[series == "None"] = "Aucun"
+                    # Translate unique values.
+                    kwargs = {"lookup": lookups[table].get(field), "domain": field in self.domains[table],
+                              "default_en": self.defaults["en"][table][field],
+                              "default_fr": self.defaults["fr"][table][field]}
+                    translations = [_translate(val, **kwargs) for val in uniques]
 
-                    # Store results to dataframe.
-                    self.dframes["fr"][table][field] = series.copy(deep=True)
+                    # Remap codes to translated values and store results to dataframe, only if modified.
+                    if translations != list(uniques):
+                        translations = np.array(translations, dtype=object)
+                        df[field] = pd.Series(translations[codes], index=df.index).infer_objects()
 
                 except (AttributeError, KeyError, ValueError):
                     logger.exception(f"Unable to apply French translations for table: {table}, field: {field}.")
                     sys.exit(1)
 
     def gen_wms_attributes(self) -> None:
-        """Generate WMS attributes for roadseg."""
+        """
+        Generate WMS attributes for roadseg.
+        Note: Each query is parsed once and evaluated as a boolean mask. The mask of every sub-expression is cached since
+        many queries share the same predicates.
+        """
 
         logger.info(f"Generating WMS attributes.")
 
-        df = self.dframes["en"]["roadseg"].copy(deep=True)
+        df = self.dframes["en"]["roadseg"]
+        masks = dict()
+        match_counts = list()
+
+        def _mask(node: ast.expr) -> np.ndarray:
+            """
+            Recursively evaluates a parsed query (sub-)expression as a boolean mask. Masks are cached by expression.
+
+            :param ast.expr node: parsed query expression.
+            :return np.ndarray: boolean mask.
+            """
+
+            expr = ast.unparse(node)
+
+            if expr not in masks:
+
+                # Boolean operators: and, or.
+                if isinstance(node, ast.BoolOp):
+                    op = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+                    masks[expr] = op.reduce([_mask(value) for value in node.values])
+
+                # Unary operator: not.
+                elif isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+                    masks[expr] = ~_mask(node.operand)
+
+                # Predicates.
+                else:
+                    masks[expr] = np.asarray(df.eval(expr, engine="python"), dtype=bool)
+
+            return masks[expr]
 
         # Compile WMS queries.
         data = helpers.load_yaml(filepath.parent / "wms_queries.yaml")["queries"]
 
         # Iterative WMS scales and queries.
         for attribute in data:
-            df[attribute] = 0
-            for prov, queries in data[attribute].items():
-                if (prov == self.source) and queries:
-
-                    try:
+            mask = np.zeros(len(df), dtype=bool)
+            queries = data[attribute].get(self.source)
 
-                        # Query type: list or strings
-                        if isinstance(queries, list):
-                            for query in queries:
-                                df.loc[df.query(expr=query).index, attribute] = 1
+            if queries:
 
-                        # Query type: all
-                        elif queries.lower() == "all":
-                            df[attribute] = 1
+                try:
 
-                        # Query type: string
-                        else:
-                            df.loc[df.query(expr=queries).index, attribute] = 1
+                    # Query type: all
+                    if isinstance(queries, str) and queries.lower() == "all":
+                        mask[:] = True
+                        match_counts.append([attribute, "all", f"{len(df):,}"])
+
+                    # Query type: list or string
+                    else:
+                        for index, query in enumerate(queries if isinstance(queries, list) else [queries]):
+                            query_mask = _mask(ast.parse(query.strip(), mode="eval").body)
+                            mask |= query_mask
+                            match_counts.append([attribute, index, f"{query_mask.sum():,}"])
+
+                except (NameError, SyntaxError) as e:
+                    logger.exception(f"Unable to execute query for attribute: {attribute}.")
+                    logger.exception(e)
+                    sys.exit(1)
 
-                    except (NameError, SyntaxError) as e:
-                        logger.exception(f"Unable to execute query for attribute: {attribute}.")
-                        logger.exception(e)
-                        sys.exit(1)
+            # Store results to dataframe.
+            df[attribute] = mask.astype(int)
 
-        # Replace original dataset.
-        self.dframes["en"]["roadseg"] = df.copy(deep=True)
+        # Log query match counts.
+        if match_counts:
+            summary = tabulate(match_counts, headers=["Attribute", "Query", "Match Count"], tablefmt="rst",
+                               colalign=("left", "left", "right"))
+            logger.info("WMS query results:\n" + summary)
 
     def update_distribution_docs(self) -> None:
         """
@@ -412,6 +489,7 @@ if __name__ == "__main__":
 
     # GUI
     if sys.argv[-1] == "--gui":
+        from utils.gui import gui
         main(args=gui(main, calling_script=Path(__file__).resolve()))
 
     # CLI
@@ -0,0 +1,192 @@
+import click
+import importlib
+import logging
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import List, Union
+
+filepath = Path(__file__).resolve()
+sys.path.insert(1, filepath.parent.as_posix())
+
+
+# Set logger.
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+handler = logging.StreamHandler(sys.stdout)
+handler.setLevel(logging.INFO)
+handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s: %(message)s", "%Y-%m-%d %H:%M:%S"))
+logger.addHandler(handler)
+
+
+# Define NRN processes, in order of execution, and their process class names.
+stages = {
+    "conform": "Conform",
+    "confirm": "Confirm",
+    "validate": "Validate",
+    "export": "Export"
+}
+
+# Define NRN process descriptions.
+# Note: defined statically such that the processes are not imported when displaying the command listing.
+stage_descriptions = {
+    "conform": "Standardization and harmonization of data source(s) into NRN format.",
+    "confirm": "Generation and recovery of National Unique Identifiers (NIDs).",
+    "validate": "Enforcement of a set of validations and restrictions on NRN dataset geometry and attribution.",
+    "export": "Configuration and export of required product distribution formats."
+}
+
+
+def load_stage(stage: str) -> ModuleType:
+    """
+    Imports an NRN process module on demand.
+
+    :param str stage: NRN process name.
+    :return ModuleType: NRN process module.
+    """
+
+    # Add process directory to path, such that process-specific modules can be resolved.
+    stage_path = (filepath.parent / stage).as_posix()
+    if stage_path not in sys.path:
+        sys.path.insert(1, stage_path)
+
+    return importlib.import_module(stage)
+
+
+class NRNGroup(click.Group):
+    """Click group which resolves NRN process commands lazily, only importing the invoked process."""
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        """
+        Lists the available commands.
+
+        :param click.Context ctx: Click context.
+        :return List[str]: command names.
+        """
+
+        return [*stages, *super().list_commands(ctx)]
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Union[click.Command, None]:
+        """
+        Resolves a command by name, importing the associated NRN process, if required.
+
+        :param click.Context ctx: Click context.
+        :param str cmd_name: command name.
+        :return Union[click.Command, None]: resolved command, if any.
+        """
+
+        if cmd_name in stages:
+            return load_stage(cmd_name).main
+
+        return super().get_command(ctx, cmd_name)
+
+    def format_commands(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
+        """
+        Writes the command listing to the help page without importing any NRN process.
+
+        :param click.Context ctx: Click context.
+        :param click.HelpFormatter formatter: Click help formatter.
+        """
+
+        rows = [(name, stage_descriptions[name]) for name in stages]
+        rows.extend((name, super(NRNGroup, self).get_command(ctx, name).get_short_help_str())
+                    for name in super().list_commands(ctx))
+
+        with formatter.section("Commands"):
+            formatter.write_dl(rows)
+
+
+def parse_stages(ctx: click.Context, param: click.Parameter, value: str) -> List[str]:
+    """
+    Parses a comma-separated string of NRN process names.
+
+    :param click.Context ctx: Click context.
+    :param click.Parameter param: Click parameter.
+    :param str value: comma-separated NRN process names.
+    :return List[str]: NRN process names, in order of execution.
+    """
+
+    names = {name.strip().lower() for name in value.split(",") if name.strip()}
+
+    invalid = names - set(stages)
+    if invalid:
+        raise click.BadParameter(f"Invalid process(es): {', '.join(sorted(invalid))}. Expected one or more of: "
+                                 f"{', '.join(stages)}.")
+
+    return [name for name in stages if name in names]
+
+
+@click.group(cls=NRNGroup)
+def cli() -> None:
+    """Executes one or more NRN processes."""
+
+
+@cli.command()
+@click.argument("source", type=click.Choice(["ab", "bc", "mb", "nb", "nl", "ns", "nt", "nu", "on",
+                                             "pe", "qc", "sk", "yt"], case_sensitive=False))
+@click.option("-s", "--stages", "stage_names", type=click.STRING, default=",".join(stages), show_default=True,
+              callback=parse_stages, help="Comma-separated NRN processes to execute, in order of execution.")
+@click.option("-i", "--persist_interim", type=click.BOOL, default=False, show_default=True,
+              help="Write the interim GeoPackage after each NRN process which modifies the NRN datasets. Otherwise, "
+                   "datasets are passed between NRN processes in memory and the interim GeoPackage is only written if "
+                   "the final NRN process modifies the NRN datasets.")
+def run(source: str, stage_names: List[str], persist_interim: bool = False) -> None:
+    """
+    Executes a sequence of NRN processes, passing the NRN datasets between processes in memory.
+
+    \b
+    :param str source: abbreviation for the source province / territory.
+    :param List[str] stage_names: NRN processes to execute, in order of execution.
+    :param bool persist_interim: write the interim GeoPackage after each NRN process which modifies the NRN datasets,
+        default False.
+    """
+
+    from utils import helpers
+
+    try:
+
+        @helpers.timer
+        def _run():
+
+            interim = filepath.parents[1] / f"data/interim/{source.lower()}.gpkg"
+            dframes = None
+
+            # Load interim data, unless created by the first process.
+            if stage_names[0] != "conform":
+                dframes = helpers.load_gpkg(interim)
+
+            for stage in stage_names:
+
+                logger.info(f"Executing NRN process: {stage}.")
+
+                process_class = getattr(load_stage(stage), stages[stage])
+
+                # Execute process.
+                if stage == "conform":
+                    process = process_class(source, persist=False)
+                    process()
+                    dframes = helpers.standardize_dframes(process.target_gdframes)
+
+                elif stage == "confirm":
+                    process = process_class(source, dframes=dframes, persist=False)
+                    process()
+                    dframes.update(helpers.standardize_dframes(process.dframes))
+
+                else:
+                    process = process_class(source, dframes=dframes)
+                    process()
+                    continue
+
+                # Write interim data.
+                if persist_interim or stage == stage_names[-1]:
+                    helpers.export(dframes, interim)
+
+        _run()
+
+    except KeyboardInterrupt:
+        logger.exception("KeyboardInterrupt: Exiting program.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    cli()
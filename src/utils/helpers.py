@@ -1,9 +1,13 @@
+import ast
+import atexit
 import datetime
-import fiona
 import geopandas as gpd
+import hashlib
 import logging
 import numpy as np
 import pandas as pd
+import pickle
+import pyogrio
 import random
 import requests
 import sqlite3
@@ -11,14 +15,15 @@ import sys
 import time
 import yaml
 from collections import ChainMap, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
 from itertools import groupby
 from operator import attrgetter, itemgetter
-from osgeo import ogr, osr
 from pathlib import Path
 from shapely import LineString, Point
 from tqdm import tqdm
 from tqdm.auto import trange
-from typing import Any, Callable, Dict, List, Type, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple, Type, Union
 
 
 # Set logger.
@@ -30,16 +35,111 @@ handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s: %(message)s
 logger.addHandler(handler)
 
 
-# Enable ogr exceptions.
-ogr.UseExceptions()
-
-
 # Define globally accessible variables.
 filepath = Path(__file__).resolve()
 distribution_format_path = filepath.parents[1] / "distribution_format.yaml"
 field_domains_path = {lang: filepath.parents[1] / f"field_domains_{lang}.yaml" for lang in ("en", "fr")}
 
 
+# Define shared HTTP session reference.
+_session = None
+
+
+class SchemaRegistry:
+    """
+    Loads and compiles the NRN schema yamls once per process. All results are shared by the callers and must be treated
+    as read-only. Optionally, results are cached on disk and reused by subsequent processes until any of the schema
+    yamls, or this module, is modified. The on-disk cache is written once, at exit of the process which compiled the
+    results, rather than on every insert.
+    """
+
+    def __init__(self, paths: List[Path], cache_path: Union[None, Path] = None) -> None:
+        """
+        Initializes the schema registry.
+
+        :param List[Path] paths: paths to the schema yamls which invalidate the cache when modified.
+        :param Union[None, Path] cache_path: optional path to the on-disk cache, default None (no on-disk cache).
+        """
+
+        self.paths = [*map(Path, paths), filepath]
+        self.cache_path = cache_path
+        self.cache = dict()
+        self.modified = False
+        self.mtimes = {path.as_posix(): path.stat().st_mtime_ns for path in self.paths if path.exists()}
+
+        # Load on-disk cache, if still valid.
+        if self.cache_path and self.cache_path.exists():
+            try:
+                with open(self.cache_path, "rb") as f:
+                    cache = pickle.load(f)
+                if cache["mtimes"] == self.mtimes:
+                    self.cache = cache["cache"]
+            except (EOFError, KeyError, OSError, pickle.UnpicklingError):
+                logger.warning(f"Unable to load schema cache: {self.cache_path}. Schemas will be recompiled.")
+
+        # Write on-disk cache at exit.
+        # Note: worker processes exit without running exit handlers, such that only the parent process writes.
+        if self.cache_path:
+            atexit.register(self.dump)
+
+    def dump(self) -> None:
+        """Writes the in-memory cache to the on-disk cache, if configured and modified since the last write."""
+
+        if self.cache_path and self.modified:
+            try:
+                self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.cache_path.with_name(f"{self.cache_path.name}.{random.getrandbits(32):08x}")
+                with open(tmp, "wb") as f:
+                    pickle.dump({"mtimes": self.mtimes, "cache": self.cache}, f, protocol=pickle.HIGHEST_PROTOCOL)
+                tmp.replace(self.cache_path)
+                self.modified = False
+            except OSError:
+                logger.warning(f"Unable to write schema cache: {self.cache_path}.")
+
+    def load(self, path: Union[Path, str]) -> Any:
+        """
+        Loads the content of a YAML file as a Python object, reusing the cached content unless the file was modified.
+
+        :param Union[Path, str] path: path to the YAML file.
+        :return Any: Python object consisting of the YAML content.
+        """
+
+        path = Path(path).resolve()
+        key = ("load_yaml", path.as_posix())
+        mtime = path.stat().st_mtime_ns
+
+        if key not in self.cache or self.cache[key][0] != mtime:
+            self.cache[key] = (mtime, load_yaml(path))
+            self.modified = True
+
+        return self.cache[key][1]
+
+    def memoize(self, func: Callable) -> Callable:
+        """
+        Decorator which caches the results of a schema compilation function by its arguments.
+
+        :param Callable func: schema compilation function.
+        :return Callable: memoized function.
+        """
+
+        @wraps(func)
+        def wrapper(*args, **kwargs) -> Any:
+            key = (func.__name__, args, tuple(sorted(kwargs.items())))
+
+            if key not in self.cache:
+                self.cache[key] = func(*args, **kwargs)
+                self.modified = True
+
+            return self.cache[key]
+
+        return wrapper
+
+
+# Define process-wide schema registry.
+schemas = SchemaRegistry([distribution_format_path, *field_domains_path.values()],
+                         cache_path=filepath.parents[2] / "data/cache/schemas.pkl")
+
+
 def apply_domain(series: pd.Series, domain: dict, default: Any) -> pd.Series:
     """
     Applies a domain restriction to the given Series based on a domain dictionary.
@@ -106,6 +206,7 @@ def cast_dtype(val: Any, dtype: Type, default: Any) -> Any:
         return default
 
 
+@schemas.memoize
 def compile_default_values(lang: str = "en") -> dict:
     """
     Compiles the default value for each field in each NRN dataset.
@@ -114,8 +215,8 @@ def compile_default_values(lang: str = "en") -> dict:
     :return dict: dictionary of default values for each attribute of each NRN dataset.
     """
 
-    dft_vals = load_yaml(field_domains_path[lang])["default"]
-    dist_format = load_yaml(distribution_format_path)
+    dft_vals = schemas.load(field_domains_path[lang])["default"]
+    dist_format = schemas.load(distribution_format_path)
     defaults = dict()
 
     try:
@@ -140,6 +241,7 @@ def compile_default_values(lang: str = "en") -> dict:
     return defaults
 
 
+@schemas.memoize
 def compile_domains(mapped_lang: str = "en") -> dict:
     """
     Compiles the acceptable domain values for each field in each NRN dataset. Each domain will consist of the following
@@ -156,7 +258,7 @@ def compile_domains(mapped_lang: str = "en") -> dict:
     domains = defaultdict(dict)
 
     # Load domain yamls.
-    domain_yamls = {lang: load_yaml(field_domains_path[lang]) for lang in ("en", "fr")}
+    domain_yamls = {lang: schemas.load(field_domains_path[lang]) for lang in ("en", "fr")}
 
     # Iterate tables and fields with domains.
     for table in domain_yamls["en"]["tables"]:
@@ -209,6 +311,7 @@ def compile_domains(mapped_lang: str = "en") -> dict:
     return domains
 
 
+@schemas.memoize
 def compile_dtypes(length: bool = False) -> dict:
     """
     Compiles the dtype for each field in each NRN dataset. Optionally includes the field length.
@@ -217,7 +320,7 @@ def compile_dtypes(length: bool = False) -> dict:
     :return dict: dictionary of dtypes and, optionally, length for each attribute of each NRN dataset.
     """
 
-    dist_format = load_yaml(distribution_format_path)
+    dist_format = schemas.load(distribution_format_path)
     dtypes = dict()
 
     try:
@@ -267,6 +370,203 @@ def delete_contents(path: Path) -> None:
         sys.exit(1)
 
 
+def download(url: str, dst: Union[Path, str], checksum: Union[None, str] = None, max_attempts: int = 10,
+             chunk_size: int = 64 * 1024, **kwargs: dict) -> Tuple[requests.Response, Union[None, str]]:
+    """
+    Downloads the content of a url to a file. Content is streamed into <dst>.part and only moved to the destination
+    once complete. Partial downloads, including those of previous, interrupted calls, are resumed via HTTP Range
+    requests, conditional on the remote content being unchanged (If-Range). The validator (ETag or Last-Modified) of a
+    partial download is stored in <dst>.part.validator, partial downloads without a validator are discarded.
+
+    :param str url: string url.
+    :param Union[Path, str] dst: output path.
+    :param Union[None, str] checksum: optional expected sha256 hex digest of the content, default None.
+    :param int max_attempts: maximum amount of attempts to get a complete response from the url.
+    :param int chunk_size: number of bytes read into memory at once, default 64 KiB.
+    :param dict \*\*kwargs: keyword arguments passed to :func:`get_url`.
+    :return Tuple[requests.Response, Union[None, str]]: final response from the url and sha256 hex digest of the
+        content. The digest is None and no file is written if the response is 304 (Not Modified).
+    """
+
+    def get_validator(response: requests.Response) -> Union[None, str]:
+        """
+        Fetches the validator of a response, usable as an If-Range header. Weak ETags are not usable.
+
+        :param requests.Response response: response.
+        :return Union[None, str]: ETag or Last-Modified header value, if any.
+        """
+
+        etag = response.headers.get("ETag")
+        if etag and not etag.startswith("W/"):
+            return etag
+        return response.headers.get("Last-Modified")
+
+    def hash_prefix(size: int) -> Any:
+        """
+        Hashes the first bytes of the partial download.
+
+        :param int size: number of bytes to hash.
+        :return Any: sha256 hash object.
+        """
+
+        digest = hashlib.sha256()
+        with open(part, "rb") as f:
+            while size > 0:
+                chunk = f.read(min(chunk_size, size))
+                if not chunk:
+                    break
+                digest.update(chunk)
+                size -= len(chunk)
+
+        return digest
+
+    def discard() -> None:
+        """Removes the partial download and its validator."""
+
+        part.unlink(missing_ok=True)
+        validator_path.unlink(missing_ok=True)
+
+    dst = Path(dst)
+    part = dst.with_name(f"{dst.name}.part")
+    validator_path = dst.with_name(f"{dst.name}.part.validator")
+    headers = {"Accept-Encoding": "identity", **(kwargs.pop("headers", None) or dict())}
+    kwargs.pop("stream", None)
+    attempt = 1
+
+    # Load the validator of a partial download of a previous call.
+    validator = validator_path.read_text().strip() if validator_path.exists() else None
+    if part.exists() and not validator:
+        logger.warning(f"Discarding partial download without a validator: {part}.")
+        discard()
+
+    # Configure sha256 hash and number of hashed bytes of the partial download.
+    sha256, hashed = hashlib.sha256(), 0
+
+    while True:
+
+        # Configure request headers to resume partial download.
+        # Note: partial downloads are only resumable if the remote content can be validated as unchanged.
+        offset = part.stat().st_size if part.exists() else 0
+        if offset and not validator:
+            discard()
+            offset = 0
+
+        request_headers = headers.copy()
+        if offset:
+            request_headers["Range"] = f"bytes={offset}-"
+            request_headers["If-Range"] = validator
+
+        response = get_url(url, max_attempts=max_attempts, stream=True, headers=request_headers, **kwargs)
+
+        try:
+
+            # Remote content has not changed.
+            if response.status_code == 304:
+                return response, None
+
+            # Partial download is already complete or invalid.
+            if response.status_code == 416:
+                if response.headers.get("Content-Range", "").endswith(f"/{offset}") and \
+                        get_validator(response) in {None, validator}:
+                    break
+                discard()
+                continue
+
+            response.raise_for_status()
+
+            # Compile expected content size.
+            if response.status_code == 206:
+
+                # Discard partial download if the remote content changed despite If-Range.
+                if get_validator(response) not in {None, validator}:
+                    logger.warning(f"Remote content changed, discarding partial download: {part}.")
+                    discard()
+                    continue
+
+                size = int(response.headers["Content-Range"].rsplit("/", 1)[-1])
+
+                # Hash the existing partial download, if not already hashed.
+                if hashed != offset:
+                    sha256, hashed = hash_prefix(offset), offset
+
+            else:
+                offset = 0
+                size = int(response.headers["Content-Length"]) if "Content-Length" in response.headers else None
+                sha256, hashed = hashlib.sha256(), 0
+
+                # Store validator of the new content.
+                validator = get_validator(response)
+                if validator:
+                    validator_path.write_text(validator)
+                else:
+                    validator_path.unlink(missing_ok=True)
+
+            # Write (append to partial download, if resumed) and hash content.
+            with open(part, "ab" if offset else "wb") as f:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    f.write(chunk)
+                    sha256.update(chunk)
+                    hashed += len(chunk)
+
+            # Validate download completeness.
+            if size is not None and part.stat().st_size != size:
+                raise requests.exceptions.ConnectionError(f"Incomplete download: received {part.stat().st_size} of "
+                                                          f"{size} bytes.")
+
+            break
+
+        except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError) as e:
+
+            if attempt >= max_attempts:
+                logger.exception(f"Maximum attempts reached ({max_attempts}). Unable to download: {url}.")
+                logger.exception(e)
+                sys.exit(1)
+
+            # Resume with exponential backoff.
+            backoff = 2 ** attempt + random.random() * 0.01
+            logger.warning(f"Download interrupted. Backing off for {round(backoff, 2)} seconds before resuming.")
+            logger.exception(e)
+            time.sleep(backoff)
+            attempt += 1
+
+        finally:
+            response.close()
+
+    # Hash the partial download, if completed by a previous call.
+    size = part.stat().st_size
+    if hashed != size:
+        sha256 = hash_prefix(size)
+    digest = sha256.hexdigest()
+
+    # Validate checksum.
+    if checksum and digest != checksum.lower():
+        discard()
+        logger.exception(f"Checksum mismatch for download: {url}. Expected {checksum}, received {digest}.")
+        sys.exit(1)
+
+    # Move completed download to destination.
+    part.replace(dst)
+    validator_path.unlink(missing_ok=True)
+
+    return response, digest
+
+
+def download_all(downloads: Dict[str, dict], max_workers: int = 4) -> \
+        Dict[str, Tuple[requests.Response, Union[None, str]]]:
+    """
+    Downloads the contents of multiple urls concurrently.
+
+    :param Dict[str, dict] downloads: dictionary of urls and keyword arguments passed to :func:`download`.
+    :param int max_workers: maximum number of concurrent downloads, default 4.
+    :return Dict[str, Tuple[requests.Response, Union[None, str]]]: dictionary of urls and results of
+        :func:`download`.
+    """
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {url: executor.submit(download, url, **kwargs) for url, kwargs in downloads.items()}
+        return {url: future.result() for url, future in futures.items()}
+
+
 def explode_geometry(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
     """
     Explodes MultiLineStrings and MultiPoints to LineStrings and Points, respectively.
@@ -296,8 +596,8 @@ def explode_geometry(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
 
 
 def export(dfs: Dict[str, Union[gpd.GeoDataFrame, pd.DataFrame]], dst: Path, driver: str = "GPKG",
-           name_schemas: Union[None, dict] = None, merge_schemas: bool = False, keep_uuid: bool = True,
-           outer_pbar: Union[tqdm, trange, None] = None) -> None:
+           name_schemas: Union[None, dict] = None, type_schemas: Union[None, dict] = None,
+           merge_schemas: bool = False, keep_uuid: bool = True, outer_pbar: Union[tqdm, trange, None] = None) -> None:
     """
     Exports one or more (Geo)DataFrames as a specified OGR driver file / layer.
 
@@ -314,12 +614,18 @@ def export(dfs: Dict[str, Union[gpd.GeoDataFrame, pd.DataFrame]], dst: Path, dri
                     ...
             ...
         }
+    :param Union[None, dict] type_schemas: optional dictionary of type schemas for each provided dataset, following the
+        structure of distribution_format.yaml, default None (all schemas are taken from distribution_format.yaml).
     :param bool merge_schemas: optional flag to merge type and name schemas such that attributes from any dataset can
         exist on each provided dataset, default False.
     :param bool keep_uuid: optional flag to preserve the uuid column, default True.
     :param Union[tqdm, trange, None] outer_pbar: optional pre-existing tqdm progress bar.
     """
 
+    # Import GDAL on demand and enable ogr exceptions.
+    from osgeo import ogr, osr
+    ogr.UseExceptions()
+
     try:
 
         # Validate / create driver.
@@ -339,7 +645,8 @@ def export(dfs: Dict[str, Union[gpd.GeoDataFrame, pd.DataFrame]], dst: Path, dri
             source = None
 
         # Compile type schemas, conditionally merge.
-        type_schemas = load_yaml(distribution_format_path)
+        if not type_schemas:
+            type_schemas = schemas.load(distribution_format_path)
         if merge_schemas:
             merged = {"spatial": any(type_schemas[table]["spatial"] for table in dfs),
                       "fields": dict(ChainMap(*[type_schema["fields"] for table, type_schema in type_schemas.items()]))}
@@ -350,6 +657,12 @@ def export(dfs: Dict[str, Union[gpd.GeoDataFrame, pd.DataFrame]], dst: Path, dri
             name_schemas = {table: {"name": table, "fields": dict(zip(table_schema["fields"], table_schema["fields"]))}
                             for table, table_schema in type_schemas.items()}
 
+        # Start data source transaction, if supported.
+        # Note: writes all layers within a single transaction instead of one transaction per layer.
+        transaction = bool(dst.suffix) and source.TestCapability(ogr.ODsCTransactions)
+        if transaction:
+            source.StartTransaction()
+
         # Iterate dataframes.
         for table, df in dfs.items():
 
@@ -400,7 +713,8 @@ def export(dfs: Dict[str, Union[gpd.GeoDataFrame, pd.DataFrame]], dst: Path, dri
                     df[col] = df[col].dt.strftime("%Y%m%d").map(int)
 
             # Write layer.
-            layer.StartTransaction()
+            if not transaction:
+                layer.StartTransaction()
 
             for feat in tqdm(df.itertuples(index=False), total=len(df),
                              desc=f"Writing to file={source.GetName()}, layer={table}",
@@ -427,12 +741,17 @@ def export(dfs: Dict[str, Union[gpd.GeoDataFrame, pd.DataFrame]], dst: Path, dri
                 # Clear pointer for next iteration.
                 feature = None
 
-            layer.CommitTransaction()
+            if not transaction:
+                layer.CommitTransaction()
 
             # Update outer progress bar.
             if outer_pbar:
                 outer_pbar.update(1)
 
+        # Commit data source transaction.
+        if transaction:
+            source.CommitTransaction()
+
     except FileExistsError as e:
         logger.exception(f"Invalid output directory - already exists.")
         logger.exception(e)
@@ -443,6 +762,54 @@ def export(dfs: Dict[str, Union[gpd.GeoDataFrame, pd.DataFrame]], dst: Path, dri
         sys.exit(1)
 
 
+def format_gpkg_layer(df: Union[gpd.GeoDataFrame, pd.DataFrame], fields: dict) -> \
+        Union[gpd.GeoDataFrame, pd.DataFrame]:
+    """
+    Standardizes a (Geo)DataFrame loaded from a GeoPackage layer as an NRN dataset.
+
+    :param Union[gpd.GeoDataFrame, pd.DataFrame] df: (Geo)DataFrame.
+    :param dict fields: dictionary of NRN dataset field names and specifications (distribution format).
+    :return Union[gpd.GeoDataFrame, pd.DataFrame]: standardized (Geo)DataFrame.
+    """
+
+    # Convert column names to lowercase.
+    df = df.rename(columns=str.lower)
+
+    # Set index field: uuid.
+    if "uuid" in df.columns:
+        df.index = df["uuid"]
+
+    # Drop fid field (this field is automatically generated and not part of the NRN).
+    if "fid" in df.columns:
+        df.drop(columns=["fid"], inplace=True)
+
+    # Fill nulls with -1 (numeric fields) / "Unknown" (string fields).
+    values = {field: {"float": -1, "int": -1, "str": "Unknown"}[specs[0]] for field, specs in fields.items()
+              if field in df.columns}
+    df.fillna(value=values, inplace=True)
+
+    return df
+
+
+def get_session() -> requests.Session:
+    """
+    Returns the HTTP session shared by all requests of the current process, creating it on first use. The session
+    pools connections per host, such that repeated and concurrent requests reuse existing connections.
+
+    :return requests.Session: HTTP session.
+    """
+
+    global _session
+
+    if _session is None:
+        _session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=16)
+        _session.mount("http://", adapter)
+        _session.mount("https://", adapter)
+
+    return _session
+
+
 def get_url(url: str, attempt: int = 1, max_attempts=10, **kwargs: dict) -> requests.Response:
     """
     Fetches a response from a url, using exponential backoff for failed attempts.
@@ -450,42 +817,94 @@ def get_url(url: str, attempt: int = 1, max_attempts=10, **kwargs: dict) -> requ
     :param str url: string url.
     :param int attempt: current count of attempts to get a response from the url.
     :param int max_attempts: maximum amount of attempts to get a response from the url.
-    :param dict \*\*kwargs: keyword arguments passed to :func:`~requests.get`.
+    :param dict \*\*kwargs: keyword arguments passed to :func:`~requests.Session.get`.
     :return requests.Response: response from the url.
     """
 
-    logger.info(f"Fetching url request from: {url} [attempt {attempt}].")
+    while attempt < max_attempts:
+
+        logger.info(f"Fetching url request from: {url} [attempt {attempt}].")
+
+        try:
+
+            # Get url response.
+            return get_session().get(url, **kwargs)
+
+        except requests.exceptions.SSLError as e:
+            logger.warning("Invalid or missing SSL certificate for the provided URL. Retrying without SSL "
+                           "verification...")
+            logger.exception(e)
+
+            # Retry without SSL verification.
+            kwargs["verify"] = False
+
+        except (TimeoutError, requests.exceptions.ConnectionError, requests.exceptions.RequestException) as e:
+            # Retry with exponential backoff.
+            backoff = 2 ** attempt + random.random() * 0.01
+            logger.warning(f"URL request failed. Backing off for {round(backoff, 2)} seconds before retrying.")
+            logger.exception(e)
+            time.sleep(backoff)
+
+        attempt += 1
+
+    logger.exception(f"Maximum attempts reached ({max_attempts}). Unable to get URL response.")
+    sys.exit(1)
+
+
+def iter_gpkg_layer(gpkg_path: Union[Path, str], layer: str, chunk_size: int = 100000, find: bool = False,
+                    columns: Union[None, List[str]] = None) -> Iterator[Union[gpd.GeoDataFrame, pd.DataFrame]]:
+    """
+    Streams an NRN dataset from a GeoPackage layer as a sequence of (Geo)DataFrame chunks of bounded size. Intended for
+    processes which can be applied chunk-wise, such that the full layer never needs to be held in memory.
+
+    :param Union[Path, str] gpkg_path: path to the GeoPackage.
+    :param str layer: NRN dataset name.
+    :param int chunk_size: maximum number of records per chunk, default 100000.
+    :param bool find: searches for the NRN dataset in the GeoPackage based on non-exact matches with the expected
+        dataset name, default False.
+    :param Union[None, List[str]] columns: optional list of field names to load, default None (all fields).
+    :return Iterator[Union[gpd.GeoDataFrame, pd.DataFrame]]: iterator of (Geo)DataFrame chunks.
+    """
+
+    distribution_format = schemas.load(distribution_format_path)
+    gpkg_path = Path(gpkg_path).resolve()
+    spatial = distribution_format[layer]["spatial"]
+
+    # Validate layer.
+    layers_map = map_gpkg_layers(gpkg_path, [layer], find=find)
+    if layer not in layers_map:
+        logger.exception(f"Unable to find layer: {layer} in GeoPackage: {gpkg_path}.")
+        sys.exit(1)
+
+    # Always load index field: uuid.
+    if columns:
+        columns = list(dict.fromkeys(["uuid", *columns]))
+
+    logger.info(f"Streaming layer: {layer} in chunks of {chunk_size} records.")
 
     try:
 
-        # Get url response.
-        if attempt < max_attempts:
-            response = requests.get(url, **kwargs)
-        else:
-            logger.exception(f"Maximum attempts reached ({max_attempts}). Unable to get URL response.")
-            sys.exit(1)
+        with pyogrio.open_arrow(gpkg_path, layer=layers_map[layer], columns=columns, read_geometry=spatial,
+                                batch_size=chunk_size, use_pyarrow=True) as (meta, reader):
 
-    except requests.exceptions.SSLError as e:
-        logger.warning("Invalid or missing SSL certificate for the provided URL. Retrying without SSL verification...")
-        logger.exception(e)
+            for batch in reader:
+                df = batch.to_pandas()
 
-        # Retry without SSL verification.
-        kwargs["verify"] = False
-        return get_url(url, attempt+1, **kwargs)
+                # Convert wkb geometries.
+                if spatial:
+                    geometry = gpd.GeoSeries.from_wkb(df.pop(meta["geometry_name"]), index=df.index, crs=meta["crs"])
+                    df = gpd.GeoDataFrame(df, geometry=geometry)
 
-    except (TimeoutError, requests.exceptions.ConnectionError, requests.exceptions.RequestException) as e:
-        # Retry with exponential backoff.
-        backoff = 2 ** attempt + random.random() * 0.01
-        logger.warning(f"URL request failed. Backing off for {round(backoff, 2)} seconds before retrying.")
-        logger.exception(e)
-        time.sleep(backoff)
-        return get_url(url, attempt+1, **kwargs)
+                yield format_gpkg_layer(df, distribution_format[layer]["fields"])
 
-    return response
+    except (pyogrio.errors.DataLayerError, pyogrio.errors.DataSourceError) as e:
+        logger.exception(f"Unable to stream layer: {layer}.")
+        logger.exception(e)
+        sys.exit(1)
 
 
-def load_gpkg(gpkg_path: Union[Path, str], find: bool = False, layers: Union[None, List[str]] = None) -> \
-        Dict[str, Union[gpd.GeoDataFrame, pd.DataFrame]]:
+def load_gpkg(gpkg_path: Union[Path, str], find: bool = False, layers: Union[None, List[str]] = None,
+              columns: Union[None, Dict[str, List[str]]] = None) -> Dict[str, Union[gpd.GeoDataFrame, pd.DataFrame]]:
     """
     Compiles a dictionary of NRN dataset names and associated (Geo)DataFrame from GeoPackage layers.
 
@@ -493,6 +912,8 @@ def load_gpkg(gpkg_path: Union[Path, str], find: bool = False, layers: Union[Non
     :param bool find: searches for NRN datasets in the GeoPackage based on non-exact matches with the expected dataset
         names, default False.
     :param Union[None, List[str]] layers: layer name or list of layer names to return instead of all NRN datasets.
+    :param Union[None, Dict[str, List[str]]] columns: optional dictionary of NRN dataset names and the list of field
+        names to load for that dataset. Datasets not included load all fields, default None.
     :return Dict[str, Union[gpd.GeoDataFrame, pd.DataFrame]]: dictionary of NRN dataset names and associated
         (Geo)DataFrames.
     """
@@ -500,7 +921,8 @@ def load_gpkg(gpkg_path: Union[Path, str], find: bool = False, layers: Union[Non
     logger.info(f"Loading GeoPackage: {gpkg_path}.")
 
     dframes = dict()
-    distribution_format = load_yaml(distribution_format_path)
+    columns = columns or dict()
+    distribution_format = schemas.load(distribution_format_path)
     gpkg_path = Path(gpkg_path).resolve()
 
     if gpkg_path.exists():
@@ -509,29 +931,8 @@ def load_gpkg(gpkg_path: Union[Path, str], find: bool = False, layers: Union[Non
         if layers:
             distribution_format = {k: v for k, v in distribution_format.items() if k in layers}
 
-        try:
-
-            # Create sqlite connection.
-            con = sqlite3.connect(gpkg_path)
-            cur = con.cursor()
-
-            # Load GeoPackage table names.
-            gpkg_layers = list(zip(*cur.execute("select name from sqlite_master where type='table';").fetchall()))[0]
-
-            # Create table name mapping.
-            layers_map = dict()
-            if find:
-                for table_name in distribution_format:
-                    for layer_name in gpkg_layers:
-                        if layer_name.lower().find(table_name) >= 0:
-                            layers_map[table_name] = layer_name
-                            break
-            else:
-                layers_map = {name: name for name in set(distribution_format).intersection(set(gpkg_layers))}
-
-        except sqlite3.Error:
-            logger.exception(f"Unable to connect to GeoPackage: {gpkg_path}.")
-            sys.exit(1)
+        # Create table name mapping.
+        layers_map = map_gpkg_layers(gpkg_path, distribution_format, find=find)
 
         # Compile missing layers.
         missing_layers = set(distribution_format) - set(layers_map)
@@ -540,40 +941,28 @@ def load_gpkg(gpkg_path: Union[Path, str], find: bool = False, layers: Union[Non
                            f"exception may be raised later on if any of these layers are required.")
 
         # Load GeoPackage layers as (geo)dataframes.
-        # Convert column names to lowercase on import.
         for table_name in layers_map:
 
             logger.info(f"Loading layer: {table_name}.")
 
             try:
 
-                # Spatial data.
-                if distribution_format[table_name]["spatial"]:
-                    df = gpd.read_file(gpkg_path, layer=layers_map[table_name]).rename(columns=str.lower)
-
-                # Tabular data.
-                else:
-                    df = pd.read_sql_query(f"select * from {layers_map[table_name]}", con).rename(columns=str.lower)
+                # Compile field names to load, always including index field: uuid.
+                fields = None
+                if columns.get(table_name):
+                    fields = list(dict.fromkeys(["uuid", *columns[table_name]]))
 
-                # Set index field: uuid.
-                if "uuid" in df.columns:
-                    df.index = df["uuid"]
-
-                # Drop fid field (this field is automatically generated and not part of the NRN).
-                if "fid" in df.columns:
-                    df.drop(columns=["fid"], inplace=True)
-
-                # Fill nulls with -1 (numeric fields) / "Unknown" (string fields).
-                values = {field: {"float": -1, "int": -1, "str": "Unknown"}[specs[0]] for field, specs in
-                          distribution_format[table_name]["fields"].items()}
-                df.fillna(value=values, inplace=True)
+                # Load layer via arrow. Tabular layers are returned as DataFrames.
+                df = pyogrio.read_dataframe(gpkg_path, layer=layers_map[table_name], columns=fields,
+                                            read_geometry=distribution_format[table_name]["spatial"], use_arrow=True)
 
                 # Store result.
-                dframes[table_name] = df.copy(deep=True)
+                dframes[table_name] = format_gpkg_layer(df, distribution_format[table_name]["fields"])
                 logger.info(f"Successfully loaded layer as dataframe: {table_name}.")
 
-            except (fiona.errors.DriverError, pd.io.sql.DatabaseError, sqlite3.Error):
+            except (pyogrio.errors.DataLayerError, pyogrio.errors.DataSourceError) as e:
                 logger.exception(f"Unable to load layer: {table_name}.")
+                logger.exception(e)
                 sys.exit(1)
 
     else:
@@ -603,6 +992,41 @@ def load_yaml(path: Union[Path, str]) -> Any:
             logger.exception(f"Unable to load yaml: {path}.")
 
 
+def map_gpkg_layers(gpkg_path: Path, table_names: Iterable[str], find: bool = False) -> Dict[str, str]:
+    """
+    Maps NRN dataset names to GeoPackage layer names, as registered in the GeoPackage contents table.
+
+    :param Path gpkg_path: path to the GeoPackage.
+    :param Iterable[str] table_names: NRN dataset names.
+    :param bool find: searches for NRN datasets in the GeoPackage based on non-exact matches with the expected dataset
+        names, default False.
+    :return Dict[str, str]: dictionary of NRN dataset names and associated GeoPackage layer names.
+    """
+
+    try:
+
+        # Load GeoPackage layer names.
+        with sqlite3.connect(gpkg_path) as con:
+            gpkg_layers = [row[0] for row in con.execute("select table_name from gpkg_contents;").fetchall()]
+
+    except sqlite3.Error:
+        logger.exception(f"Unable to connect to GeoPackage: {gpkg_path}.")
+        sys.exit(1)
+
+    # Create table name mapping.
+    layers_map = dict()
+    if find:
+        for table_name in table_names:
+            for layer_name in gpkg_layers:
+                if layer_name.lower().find(table_name) >= 0:
+                    layers_map[table_name] = layer_name
+                    break
+    else:
+        layers_map = {name: name for name in table_names if name in set(gpkg_layers)}
+
+    return layers_map
+
+
 def round_coordinates(gdf: gpd.GeoDataFrame, precision: int = 7) -> gpd.GeoDataFrame:
     """
     Rounds the GeoDataFrame geometry coordinates to a specific decimal precision.
@@ -647,6 +1071,45 @@ def round_coordinates(gdf: gpd.GeoDataFrame, precision: int = 7) -> gpd.GeoDataF
         sys.exit(1)
 
 
+def standardize_dframes(dfs: Dict[str, Union[gpd.GeoDataFrame, pd.DataFrame]]) -> \
+        Dict[str, Union[gpd.GeoDataFrame, pd.DataFrame]]:
+    """
+    Standardizes in-memory NRN datasets equivalently to exporting and reloading them via :func:`export` and
+    :func:`load_gpkg`, such that NRN processes can be chained without intermediate GeoPackages. Only fields of the
+    distribution format (plus uuid and geometry) are kept and values are cast to the distribution format dtypes.
+
+    :param Dict[str, Union[gpd.GeoDataFrame, pd.DataFrame]] dfs: dictionary of NRN dataset names and (Geo)DataFrames.
+    :return Dict[str, Union[gpd.GeoDataFrame, pd.DataFrame]]: dictionary of NRN dataset names and standardized
+        (Geo)DataFrames.
+    """
+
+    distribution_format = schemas.load(distribution_format_path)
+    dframes = dict()
+
+    for table, df in dfs.items():
+
+        fields = distribution_format[table]["fields"]
+
+        # Filter fields.
+        keep = {*fields, "uuid"}
+        if isinstance(df, gpd.GeoDataFrame):
+            keep.add(df.geometry.name)
+        df = format_gpkg_layer(df[[col for col in df.columns if col in keep]], fields)
+
+        # Cast fields to distribution format dtypes.
+        for field in set(fields).intersection(df.columns):
+            dtype = fields[field][0]
+            if dtype == "str":
+                df[field] = df[field].astype(str)
+            else:
+                df[field] = pd.to_numeric(df[field], errors="coerce").fillna(-1).astype(
+                    {"float": "float64", "int": "int64"}[dtype])
+
+        dframes[table] = df
+
+    return dframes
+
+
 def timer(func: Callable) -> Any:
     """Tracks function runtime."""
 
@@ -662,3 +1125,71 @@ def timer(func: Callable) -> Any:
         return result
 
     return wrapper
+
+
+def translate_query(query: str) -> Union[None, str]:
+    """
+    Translates a pandas query into an equivalent OGR SQL attribute filter. Only comparisons of a field against literal
+    values, combined with and / or, are supported. Comparisons of type != and not in retain nulls, matching pandas
+    behaviour.
+
+    :param str query: pandas query.
+    :return Union[None, str]: OGR SQL attribute filter, or None if the query cannot be translated.
+    """
+
+    def _literal(node: ast.expr) -> str:
+        """
+        Translates a literal value node.
+
+        :param ast.expr node: literal value node.
+        :return str: OGR SQL literal value.
+        """
+
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            return "'" + node.value.replace("'", "''") + "'"
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and \
+                not isinstance(node.value, bool):
+            return repr(node.value)
+        raise ValueError(f"Unsupported literal: {ast.unparse(node)}.")
+
+    def _translate(node: ast.expr) -> str:
+        """
+        Recursively translates an expression node.
+
+        :param ast.expr node: expression node.
+        :return str: OGR SQL expression.
+        """
+
+        # Boolean operations.
+        if isinstance(node, ast.BoolOp):
+            op = {ast.And: " AND ", ast.Or: " OR "}[type(node.op)]
+            return op.join(f"({_translate(value)})" for value in node.values)
+
+        # Comparisons.
+        if isinstance(node, ast.Compare) and len(node.ops) == 1 and isinstance(node.left, ast.Name):
+            field = '"' + node.left.id.replace('"', '""') + '"'
+            op, comparator = node.ops[0], node.comparators[0]
+
+            # Membership.
+            if isinstance(comparator, (ast.List, ast.Tuple)) and isinstance(op, (ast.Eq, ast.NotEq, ast.In,
+                                                                                 ast.NotIn)):
+                vals = ", ".join(map(_literal, comparator.elts))
+                if isinstance(op, (ast.Eq, ast.In)):
+                    return f"{field} IN ({vals})"
+                return f"{field} IS NULL OR {field} NOT IN ({vals})"
+
+            # Value comparison.
+            if isinstance(op, ast.NotEq):
+                return f"{field} IS NULL OR {field} <> {_literal(comparator)}"
+            if type(op) in {ast.Eq, ast.Lt, ast.LtE, ast.Gt, ast.GtE}:
+                op = {ast.Eq: "=", ast.Lt: "<", ast.LtE: "<=", ast.Gt: ">", ast.GtE: ">="}[type(op)]
+                return f"{field} {op} {_literal(comparator)}"
+
+        raise ValueError(f"Unsupported expression: {ast.unparse(node)}.")
+
+    try:
+        return _translate(ast.parse(query, mode="eval").body)
+    except (SyntaxError, ValueError):
+        logger.info(f"Query cannot be translated into an attribute filter, applying as a pandas query instead: "
+                    f"\"{query}\".")
+        return None
@@ -1,14 +1,15 @@
 import click
 import geopandas as gpd
 import logging
+import pandas as pd
 import sys
 from pathlib import Path
 from tabulate import tabulate
+from typing import Dict, List, Union
 
 filepath = Path(__file__).resolve()
 sys.path.insert(1, filepath.parents[1].as_posix())
 from utils import helpers
-from utils.gui import gui
 from validation_functions import Validator
 
 
@@ -24,22 +25,39 @@ logger.addHandler(handler)
 class Validate:
     """Defines an NRN process."""
 
-    def __init__(self, source: str) -> None:
+    def __init__(self, source: str, only: Union[None, List[int]] = None, skip: Union[None, List[int]] = None,
+                 processes: int = 1, incremental: bool = False, errors_index: bool = False,
+                 dframes: Union[None, Dict[str, Union[gpd.GeoDataFrame, pd.DataFrame]]] = None) -> None:
         """
         Initializes an NRN process.
 
         :param str source: abbreviation for the source province / territory.
+        :param Union[None, List[int]] only: optional list of validation codes to exclusively apply, default None.
+        :param Union[None, List[int]] skip: optional list of validation codes to exclude, default None.
+        :param int processes: number of worker processes used to apply validations concurrently, default 1.
+        :param bool incremental: only revalidate records changed since the previous run, and their neighbourhood,
+            default False.
+        :param bool errors_index: export each dataset once along with an errors index table (uuid, code, dataset)
+            instead of one subset dataset per validation, default False.
+        :param Union[None, Dict[str, Union[gpd.GeoDataFrame, pd.DataFrame]]] dframes: optional dictionary of NRN dataset
+            names and (Geo)DataFrames to validate instead of loading the interim GeoPackage, default None.
         """
 
         self.source = source.lower()
+        self.only = only
+        self.skip = skip
+        self.processes = processes
+        self.incremental = incremental
+        self.errors_index = errors_index
         self.Validator = None
 
         # Configure data paths.
         self.src = Path(filepath.parents[2] / f"data/interim/{self.source}.gpkg")
         self.dst = filepath.parents[2] / f"data/interim/validations.gpkg"
+        self.state_path = filepath.parents[2] / f"data/interim/{self.source}_validations.pkl"
 
         # Validate source path.
-        if not self.src.exists():
+        if dframes is None and not self.src.exists():
             logger.exception(f"Source not found: \"{self.src}\".")
             sys.exit(1)
 
@@ -49,7 +67,7 @@ class Validate:
             self.dst.unlink()
 
         # Load source data.
-        self.dframes = helpers.load_gpkg(self.src)
+        self.dframes = helpers.load_gpkg(self.src) if dframes is None else dframes
 
     def __call__(self) -> None:
         """Executes an NRN process."""
@@ -62,16 +80,40 @@ class Validate:
 
         logger.info("Initiating validator.")
 
+        # Load validation state of the previous run.
+        state = None
+        if self.incremental:
+            if self.state_path.exists():
+                logger.info(f"Loading previous validation state: \"{self.state_path}\".")
+                state = pd.read_pickle(self.state_path)
+            else:
+                logger.warning(f"Previous validation state not found: \"{self.state_path}\". Applying validations in "
+                               f"full.")
+
         # Instantiate and execute validator class.
-        self.Validator = Validator(self.dframes, source=self.source)
+        self.Validator = Validator(self.dframes, source=self.source, only=self.only, skip=self.skip,
+                                   processes=self.processes, state=state)
         self.Validator()
 
+        # Store validation state for subsequent incremental runs.
+        logger.info(f"Writing validation state: \"{self.state_path}\".")
+        pd.to_pickle(self.Validator.get_state(), self.state_path)
+
     def _export_errors(self) -> None:
-        """Exports new subset datasets based on error flags returned by validations."""
+        """
+        Exports new subset datasets based on error flags returned by validations. Optionally, each dataset is exported
+        once along with a compact errors index table (uuid, code, dataset) instead of one subset dataset per validation.
+        """
 
         logger.info(f"Exporting subset datasets based on validation errors to: \"{self.dst}\".")
 
         error_counts = list()
+        errors_index = list()
+        dfs = dict()
+        type_schemas = dict()
+
+        # Load type schemas.
+        distribution_format = helpers.schemas.load(helpers.distribution_format_path)
 
         # Iterate error codes and datasets.
         for code in sorted(self.Validator.errors):
@@ -82,10 +124,32 @@ class Validate:
                 # Store error count.
                 error_counts.append([f"{code} ({error_name})", dataset, len(vals)])
 
-                # Subset dataset and export to validations output file.
                 if len(vals):
-                    df_subset = self.dframes[dataset].loc[self.dframes[dataset].index.isin(vals)].copy(deep=True)
-                    gpd.GeoDataFrame(df_subset).to_file(str(self.dst), layer=f"v{code}_{dataset}", index=False)
+
+                    # Compile errors index records.
+                    if self.errors_index:
+                        errors_index.append(pd.DataFrame({"uuid": sorted(vals), "code": code, "dataset": dataset}))
+
+                    # Compile subset dataset.
+                    else:
+                        layer = f"v{code}_{dataset}"
+                        dfs[layer] = self.dframes[dataset].loc[self.dframes[dataset].index.isin(vals)]
+                        type_schemas[layer] = distribution_format[dataset]
+
+        # Compile errors index and subset each dataset to all erroneous records.
+        if len(errors_index):
+            errors_index = pd.concat(errors_index, ignore_index=True)
+
+            for dataset, uuids in errors_index.groupby(by="dataset", sort=True)["uuid"]:
+                dfs[dataset] = self.dframes[dataset].loc[self.dframes[dataset].index.isin(set(uuids))]
+                type_schemas[dataset] = distribution_format[dataset]
+
+            dfs["errors"] = errors_index
+            type_schemas["errors"] = {"spatial": False, "fields": {"code": ["int", 4], "dataset": ["str", 10]}}
+
+        # Export all subset datasets to validations output file.
+        if len(dfs):
+            helpers.export(dfs, self.dst, type_schemas=type_schemas)
 
         # Log validation results summary.
         summary = tabulate(error_counts, headers=["Validation", "Dataset", "Invalid Count"], tablefmt="rst",
@@ -94,22 +158,61 @@ class Validate:
         logger.info("Validation results:\n" + summary)
 
 
+def parse_codes(ctx: click.Context, param: click.Parameter, value: Union[None, str]) -> Union[None, List[int]]:
+    """
+    Parses a comma-separated string of validation codes.
+
+    :param click.Context ctx: Click context.
+    :param click.Parameter param: Click parameter.
+    :param Union[None, str] value: comma-separated validation codes.
+    :return Union[None, List[int]]: list of validation codes, if any.
+    """
+
+    if not value:
+        return None
+
+    try:
+        return [int(code) for code in value.split(",") if code.strip()]
+    except ValueError:
+        raise click.BadParameter(f"Expected comma-separated integer validation codes, e.g. \"301,202\".")
+
+
 @click.command()
 @click.argument("source", type=click.Choice(["ab", "bc", "mb", "nb", "nl", "ns", "nt", "nu", "on",
                                              "pe", "qc", "sk", "yt"], case_sensitive=False))
-def main(source: str) -> None:
+@click.option("-o", "--only", type=click.STRING, default=None, callback=parse_codes,
+              help="Comma-separated validation codes to exclusively apply, e.g. \"301,202\".")
+@click.option("-s", "--skip", type=click.STRING, default=None, callback=parse_codes,
+              help="Comma-separated validation codes to exclude, e.g. \"1001\".")
+@click.option("-p", "--processes", type=click.INT, default=1, show_default=True,
+              help="Number of worker processes used to apply validations concurrently.")
+@click.option("-i", "--incremental", type=click.BOOL, default=False, show_default=True,
+              help="Only revalidate records changed since the previous run, and their neighbourhood. Errors of all "
+                   "other records are carried over from the previous run.")
+@click.option("-e", "--errors_index", type=click.BOOL, default=False, show_default=True,
+              help="Export each dataset once along with an errors index table (uuid, code, dataset) instead of one "
+                   "subset dataset per validation.")
+def main(source: str, only: Union[None, List[int]] = None, skip: Union[None, List[int]] = None,
+         processes: int = 1, incremental: bool = False, errors_index: bool = False) -> None:
     """
     Executes an NRN process.
 
     \b
     :param str source: abbreviation for the source province / territory.
+    :param Union[None, List[int]] only: optional list of validation codes to exclusively apply, default None.
+    :param Union[None, List[int]] skip: optional list of validation codes to exclude, default None.
+    :param int processes: number of worker processes used to apply validations concurrently, default 1.
+    :param bool incremental: only revalidate records changed since the previous run, and their neighbourhood,
+        default False.
+    :param bool errors_index: export each dataset once along with an errors index table (uuid, code, dataset) instead
+        of one subset dataset per validation, default False.
     """
 
     try:
 
         @helpers.timer
         def run():
-            process = Validate(source)
+            process = Validate(source, only, skip, processes, incremental, errors_index)
             process()
 
         run()
@@ -123,6 +226,7 @@ if __name__ == "__main__":
 
     # GUI
     if sys.argv[-1] == "--gui":
+        from utils.gui import gui
         main(args=gui(main, calling_script=Path(__file__).resolve()))
 
     # CLI
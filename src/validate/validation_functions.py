@@ -1,7 +1,10 @@
 import geopandas as gpd
 import logging
 import math
+import multiprocessing as mp
+import numpy as np
 import pandas as pd
+import shapely
 import sys
 from collections import defaultdict
 from copy import deepcopy
@@ -9,9 +12,8 @@ from datetime import datetime
 from itertools import chain
 from operator import attrgetter, itemgetter
 from pathlib import Path
-from shapely import Point
 from tqdm import trange
-from typing import Dict, Union
+from typing import Dict, List, Set, Tuple, Union
 
 filepath = Path(__file__).resolve()
 sys.path.insert(1, str(Path(__file__).resolve().parents[1]))
@@ -27,19 +29,54 @@ handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s: %(message)s
 logger.addHandler(handler)
 
 
+# Define validator reference for worker processes.
+_validator = None
+
+
+def _init_worker(validator: "Validator") -> None:
+    """
+    Stores the validator for the current worker process. Called once per worker process.
+
+    :param Validator validator: Validator instance.
+    """
+
+    global _validator
+    _validator = validator
+
+
+def _run_task(task: Tuple[int, str, Union[str, None]]) -> Tuple[int, str, set]:
+    """
+    Executes a single validation task within a worker process.
+
+    :param Tuple[int, str, Union[str, None]] task: validation code, dataset name, and optional column name.
+    :return Tuple[int, str, set]: validation code, dataset name, and set containing identifiers of erroneous records.
+    """
+
+    return _validator.run_task(task)
+
+
 class Validator:
     """Handles the execution of validation functions against the NRN datasets."""
 
-    def __init__(self, dfs: Dict[str, Union[gpd.GeoDataFrame, pd.DataFrame]], source: str) -> None:
+    def __init__(self, dfs: Dict[str, Union[gpd.GeoDataFrame, pd.DataFrame]], source: str,
+                 only: Union[None, List[int]] = None, skip: Union[None, List[int]] = None, processes: int = 1,
+                 state: Union[None, dict] = None) -> None:
         """
         Initializes variables for validation functions.
 
         :param str source: abbreviation for the source province / territory.
         :param Dict[str, Union[gpd.GeoDataFrame, pd.DataFrame]] dfs: dictionary of NRN datasets as (Geo)DataFrames.
+        :param Union[None, List[int]] only: optional list of validation codes to exclusively apply, default None.
+        :param Union[None, List[int]] skip: optional list of validation codes to exclude, default None.
+        :param int processes: number of worker processes used to apply validations concurrently, default 1.
+        :param Union[None, dict] state: optional validation state of a previous run, returned by
+            :func:`Validator.get_state`. If provided, validations are applied incrementally, default None.
         """
 
         self.errors = defaultdict(dict)
         self.source = source
+        self.processes = max(processes, 1)
+        self.state = state
         self.id = "uuid"
         self.to_crs = "EPSG:3348"
         self.dst = filepath.parents[2] / f"data/interim/{self.source}.gpkg"
@@ -48,6 +85,10 @@ class Validator:
         self.dfs = {name: df.to_crs(self.to_crs).copy(deep=True) if "geometry" in df.columns else df.copy(deep=True)
                     for name, df in dfs.items()}
 
+        # Compile content hashes and bounds of each record (used for incremental validation).
+        self.hashes = {name: self.hash_records(df) for name, df in dfs.items()}
+        self.bounds = {name: df.bounds for name, df in self.dfs.items() if "geometry" in df.columns}
+
         # Compile default field values.
         self.defaults_all = helpers.compile_default_values()
 
@@ -59,51 +100,62 @@ class Validator:
 
         # Define validation.
         # Note: List validations in order if execution order matters.
+        # Note: Incremental validations must only depend on each record and its spatial neighbourhood (see
+        # :func:`Validator.apply_incremental`).
         self.validations = {
             101: {
                 "func": self.construction_min_length,
                 "datasets": ["ferryseg", "roadseg"],
-                "iter_cols": None
+                "iter_cols": None,
+                "incremental": True
             },
             102: {
                 "func": self.construction_zero_length,
                 "datasets": ["ferryseg", "roadseg"],
-                "iter_cols": None
+                "iter_cols": None,
+                "incremental": True
             },
             103: {
                 "func": self.construction_simple,
                 "datasets": ["ferryseg", "roadseg"],
-                "iter_cols": None
+                "iter_cols": None,
+                "incremental": True
             },
             201: {
                 "func": self.duplication_duplicated,
                 "datasets": ["blkpassage", "ferryseg", "roadseg", "tollpoint"],
-                "iter_cols": None
+                "iter_cols": None,
+                "incremental": True
             },
             202: {
                 "func": self.duplication_overlap,
                 "datasets": ["ferryseg", "roadseg"],
-                "iter_cols": None
+                "iter_cols": None,
+                "incremental": True
             },
             301: {
                 "func": self.connectivity_min_distance,
                 "datasets": ["ferryseg", "roadseg"],
-                "iter_cols": None
+                "iter_cols": None,
+                "incremental": True
             },
             401: {
                 "func": self.dates_length,
                 "datasets": ["addrange", "blkpassage", "ferryseg", "roadseg", "strplaname", "tollpoint"],
-                "iter_cols": ["credate", "revdate"]
+                "iter_cols": ["credate", "revdate"],
+                "incremental": True
             },
             402: {
                 "func": self.dates_combination,
                 "datasets": ["addrange", "blkpassage", "ferryseg", "roadseg", "strplaname", "tollpoint"],
-                "iter_cols": ["credate", "revdate"]
+                "iter_cols": ["credate", "revdate"],
+                "incremental": True
             },
             403: {
                 "func": self.dates_range,
                 "datasets": ["addrange", "blkpassage", "ferryseg", "roadseg", "strplaname", "tollpoint"],
-                "iter_cols": ["credate", "revdate"]
+                "iter_cols": ["credate", "revdate"],
+                "incremental": True
             },
             501: {
                 "func": self.identifiers_nid_linkages,
@@ -114,51 +166,65 @@ class Validator:
                     "blkpassage": ["roadnid"],
                     "roadseg": ["adrangenid"],
                     "tollpoint": ["roadnid"]
-                }
+                },
+                "incremental": False
             },
             601: {
                 "func": self.exit_numbers_nid,
                 "datasets": ["roadseg"],
-                "iter_cols": None
+                "iter_cols": None,
+                "incremental": False
             },
             602: {
                 "func": self.exit_numbers_roadclass,
                 "datasets": ["roadseg"],
-                "iter_cols": None
+                "iter_cols": None,
+                "incremental": True
             },
             701: {
                 "func": self.ferry_integration_,
                 "datasets": ["ferryseg"],
-                "iter_cols": None
+                "iter_cols": None,
+                "incremental": False
             },
             801: {
                 "func": self.number_of_lanes_,
                 "datasets": ["roadseg"],
-                "iter_cols": None
+                "iter_cols": None,
+                "incremental": True
             },
             901: {
                 "func": self.speed_,
                 "datasets": ["roadseg"],
-                "iter_cols": None
+                "iter_cols": None,
+                "incremental": True
             },
             1001: {
                 "func": self.encoding_,
                 "datasets": ["addrange", "blkpassage", "ferryseg", "junction", "roadseg", "strplaname", "tollpoint"],
                 "iter_cols": {name: set(df.select_dtypes(include="object").columns) - {"geometry", "nid", "uuid"} for
-                              name, df in self.dfs.items()}
+                              name, df in self.dfs.items()},
+                "incremental": True
             }
         }
 
+        # Filter validations to the selected codes.
+        invalid_codes = set(only or list()).union(skip or list()) - set(self.validations)
+        if invalid_codes:
+            logger.exception(f"Invalid validation code(s): {', '.join(map(str, sorted(invalid_codes)))}.")
+            sys.exit(1)
+
+        if only:
+            self.validations = {code: params for code, params in self.validations.items() if code in only}
+        if skip:
+            self.validations = {code: params for code, params in self.validations.items() if code not in skip}
+
         logger.info("Generating reusable geometry attributes.")
 
         self.pts_id_lookup = {
             "ferryseg": dict(),
             "roadseg": dict()
         }
-        self.idx_id_lookup = {
-            "ferryseg": dict(),
-            "roadseg": dict()
-        }
 
         # Iterate LineString datasets.
         for dataset in {"ferryseg", "roadseg"}.intersection(set(self.dfs)):
@@ -174,7 +240,6 @@ class Validator:
             pts_df = pd.DataFrame({"pt": pts.values, self.id: pts.index})
             self.pts_id_lookup[dataset] = deepcopy(pts_df[["pt", self.id]]
                                                    .groupby(by="pt", as_index=True)[self.id].agg(set).to_dict())
-            self.idx_id_lookup[dataset] = deepcopy(dict(zip(range(len(df)), df.index)))
 
             # Store updated dataframe.
             self.dfs[dataset] = df.copy(deep=True)
@@ -184,23 +249,107 @@ class Validator:
 
         logger.info("Applying validations.")
 
+        # Apply validations incrementally, if a previous state exists.
+        if self.state:
+            self.apply_incremental()
+        else:
+            self.apply_validations(set(self.validations))
+
+    def apply_incremental(self) -> None:
+        """
+        Applies validations incrementally based on the validation state of a previous run. Incremental validations are
+        only applied to changed records and their spatial neighbourhood, the errors of all other records are carried
+        over from the previous run. All other validations, or those not applied in the previous run, are applied in
+        full.
+        """
+
+        logger.info("Compiling changed records for incremental validation.")
+
+        affected = dict()
+        context = dict()
+        deleted = dict()
+
+        # Configure incremental and full validations.
+        codes_full = {code for code, params in self.validations.items() if
+                      not params["incremental"] or code not in self.state["errors"]}
+        codes_incremental = set(self.validations) - codes_full
+
+        # Iterate datasets.
+        for dataset, hashes in self.hashes.items():
+
+            # Compile changed (new or modified) and deleted records.
+            hashes_old = self.state["hashes"].get(dataset, pd.Series(dtype="uint64"))
+            changed = hashes.index[~pd.MultiIndex.from_arrays([hashes.index, hashes.values]).isin(
+                pd.MultiIndex.from_arrays([hashes_old.index, hashes_old.values]))]
+            deleted[dataset] = set(hashes_old.index.difference(hashes.index))
+
+            # Compile affected records (changed records and the current neighbourhood of both the current and previous
+            # geometries of changed and deleted records) and their context (the neighbourhood of affected records).
+            if dataset in self.bounds:
+                bounds_old = self.state["bounds"].get(dataset, pd.DataFrame(columns=["minx", "miny", "maxx", "maxy"]))
+                bounds = pd.concat([self.bounds[dataset].loc[changed],
+                                    bounds_old.loc[bounds_old.index.isin({*changed, *deleted[dataset]})]])
+                affected[dataset] = {*changed, *self.query_neighbours(dataset, bounds)}
+                context[dataset] = {*affected[dataset], *self.query_neighbours(
+                    dataset, self.bounds[dataset].loc[self.bounds[dataset].index.isin(affected[dataset])])}
+
+            else:
+                affected[dataset] = context[dataset] = set(changed)
+
+            logger.info(f"Dataset: {dataset}. Changed records: {len(changed)}. Deleted records: "
+                        f"{len(deleted[dataset])}. Affected records: {len(affected[dataset])}.")
+
+        # Apply incremental validations to the context of affected records.
+        validator = None
+        if codes_incremental:
+
+            # Compile context datasets, excluding reusable geometry attributes.
+            dfs = {dataset: df.loc[df.index.isin(context[dataset])].drop(columns=["pts_tuple", "pt_start", "pt_end"],
+                                                                         errors="ignore")
+                   for dataset, df in self.dfs.items() if len(context[dataset])}
+
+            if len(dfs):
+
+                # Instantiate and execute validator class.
+                validator = Validator(dfs, source=self.source, only=sorted(codes_incremental),
+                                      processes=self.processes)
+                validator()
+
+            # Merge previous errors of unaffected records with new errors of affected records.
+            for code in codes_incremental:
+                for dataset in set(self.validations[code]["datasets"]).intersection(self.dfs):
+
+                    errors_old = self.state["errors"][code].get(dataset, set())
+                    errors_new = validator.errors[code].get(dataset, set()) if validator else set()
+
+                    self.errors[code][dataset] = {*(errors_old - affected[dataset] - deleted[dataset]),
+                                                  *(errors_new & affected[dataset])}
+
+        # Apply all other validations in full.
+        if codes_full:
+            self.apply_validations(codes_full)
+
+    def apply_validations(self, codes: Set[int]) -> None:
+        """
+        Applies validations to all records.
+
+        :param Set[int] codes: validation codes to be applied.
+        """
+
         try:
 
-            # Iterate validations.
-            for code, params in self.validations.items():
-                func, datasets, iter_cols = itemgetter("func", "datasets", "iter_cols")(params)
+            # Compile validation tasks as (code, dataset, column) combinations.
+            tasks = list()
+            for code, params in filter(lambda item: item[0] in codes, self.validations.items()):
+                datasets, iter_cols = itemgetter("datasets", "iter_cols")(params)
 
                 # Configure valid datasets.
-                datasets = set(datasets).intersection(self.dfs)
+                datasets = sorted(set(datasets).intersection(self.dfs))
 
                 # Reconfigure iter_cols as dict.
                 if isinstance(iter_cols, list):
                     iter_cols = {dataset: iter_cols for dataset in datasets}
 
-                # Instantiate progress bar.
-                pbar = trange(sum(map(len, itemgetter(*datasets)(iter_cols))) if iter_cols else len(datasets),
-                              desc="Applying validations.", bar_format="{desc}|{bar}| {percentage:3.0f}% {r_bar}")
-
                 # Iterate datasets.
                 for dataset in datasets:
 
@@ -209,31 +358,50 @@ class Validator:
 
                     # Iterate columns, if required.
                     if iter_cols:
+                        tasks.extend((code, dataset, col) for col in iter_cols[dataset])
+                    else:
+                        tasks.append((code, dataset, None))
 
-                        for col in iter_cols[dataset]:
-
-                            pbar.set_description(f"Applying validation {code}: \"{func.__name__}\". Current target: "
-                                                 f"{dataset}.{col}")
+            # Instantiate progress bar.
+            pbar = trange(len(tasks), desc="Applying validations.",
+                          bar_format="{desc}|{bar}| {percentage:3.0f}% {r_bar}")
 
-                            # Execute validation and store results.
-                            self.errors[code][dataset].update(deepcopy(func(dataset, col=col)))
+            # Apply validations concurrently.
+            # Note: The validator is handed to each worker once, as a fork-inherited snapshot where supported, and is
+            # treated as read-only by all validation functions.
+            if self.processes > 1 and len(tasks) > 1:
 
-                            # Update progress bar.
-                            pbar.update(1)
+                context = mp.get_context("fork" if "fork" in mp.get_all_start_methods() else None)
+                with context.Pool(processes=min(self.processes, len(tasks)), initializer=_init_worker,
+                                  initargs=(self,)) as pool:
 
-                    else:
+                    for code, dataset, errors in pool.imap_unordered(_run_task, tasks):
 
-                        pbar.set_description(f"Applying validation {code}: \"{func.__name__}\". Current target: "
-                                             f"{dataset}")
+                        pbar.set_description(f"Applying validations. Completed: {code} \"{dataset}\"")
 
-                        # Execute validation and store results.
-                        self.errors[code][dataset].update(deepcopy(func(dataset)))
+                        # Store results.
+                        self.errors[code][dataset].update(errors)
 
                         # Update progress bar.
                         pbar.update(1)
 
-                # Close progress bar.
-                pbar.close()
+            # Apply validations sequentially.
+            else:
+
+                for task in tasks:
+
+                    code, dataset, col = task
+                    pbar.set_description(f"Applying validation {code}: \"{self.validations[code]['func'].__name__}\". "
+                                         f"Current target: {dataset}{f'.{col}' if col else ''}")
+
+                    # Execute validation and store results.
+                    self.errors[code][dataset].update(self.run_task(task)[-1])
+
+                    # Update progress bar.
+                    pbar.update(1)
+
+            # Close progress bar.
+            pbar.close()
 
         except (KeyError, SyntaxError, ValueError) as e:
             logger.exception("Unable to apply validation.")
@@ -252,51 +420,33 @@ class Validator:
         errors = set()
 
         # Fetch dataframe.
-        df = self.dfs[dataset].copy(deep=True)
+        df = self.dfs[dataset]
 
         # Compile all non-duplicated nodes (dead ends) as a DataFrame.
         pts = pd.concat([df["pt_start"], df["pt_end"]])
         deadends = pts.loc[~pts.duplicated(keep=False)]
         deadends = pd.DataFrame({"pt": deadends.values, self.id: deadends.index})
-
-        # Generate simplified node buffers with distance tolerance.
-        deadends["buffer"] = deadends["pt"].map(lambda pt: Point(pt).buffer(self._min_dist, resolution=5))
-
-        # Query arcs which intersect each dead end buffer.
-        deadends["intersects"] = deadends["buffer"].map(
-            lambda buffer: set(df.sindex.query(buffer, predicate="intersects")))
-
-        # Flag dead ends which have buffers with one or more intersecting arcs.
-        deadends = deadends.loc[deadends["intersects"].map(len) > 1]
         if len(deadends):
 
-            # Aggregate deadends to their source features.
-            # Note: source features will exist twice if both nodes are deadends; these results will be aggregated.
-            deadends_agg = deadends[[self.id, "intersects"]].groupby(by=self.id, as_index=True)["intersects"]\
-                .agg(tuple).map(chain.from_iterable).map(set).to_dict()
-            deadends["intersects"] = deadends[self.id].map(deadends_agg)
-            deadends.drop_duplicates(subset=self.id, inplace=True)
+            # Query arcs within the distance tolerance of each dead end as (dead end, arc) index pairs.
+            deadend_idxs, arc_idxs = df.sindex.query(shapely.points(np.array(deadends["pt"].to_list())),
+                                                     predicate="dwithin", distance=self._min_dist)
 
-            # Compile identifiers corresponding to each 'intersects' index.
-            deadends["intersects"] = deadends["intersects"].map(
-                lambda idxs: set(itemgetter(*idxs)(self.idx_id_lookup[dataset])))
+            # Compile identifiers for each pair of dead end source feature and nearby arc.
+            pairs = pd.MultiIndex.from_arrays([deadends[self.id].values[deadend_idxs], df.index.values[arc_idxs]])
 
-            # Compile identifiers containing either of the source geometry nodes.
-            deadends["connected"] = deadends[self.id].map(
-                lambda identifier: set(chain.from_iterable(
-                    itemgetter(node)(self.pts_id_lookup[dataset]) for node in itemgetter(0, -1)(
-                        itemgetter(identifier)(df["pts_tuple"]))
-                )))
+            # Compile identifiers containing either of the source geometry nodes, for each source feature.
+            nodes = pd.concat([df["pt_start"], df["pt_end"]])
+            nodes = nodes.loc[nodes.index.isin(pairs.get_level_values(0))]
+            connected = nodes.map(self.pts_id_lookup[dataset].get).explode()
+            connected = pd.MultiIndex.from_arrays([connected.index, connected.values])
 
-            # Subtract identifiers of connected features from buffer-intersecting features.
-            deadends["disconnected"] = deadends["intersects"] - deadends["connected"]
-
-            # Filter to those results with disconnected segments.
-            flag = deadends["disconnected"].map(len) > 0
+            # Flag source features with one or more nearby arcs which are not connected.
+            flag = ~pairs.isin(connected)
 
             # Compile error logs.
-            if sum(flag):
-                errors.update(set(deadends.loc[flag, self.id]))
+            if flag.any():
+                errors.update(set(pairs[flag].get_level_values(0)))
 
         return errors
 
@@ -312,7 +462,7 @@ class Validator:
         errors = set()
 
         # Fetch dataframe.
-        df = self.dfs[dataset].copy(deep=True)
+        df = self.dfs[dataset]
 
         # Flag arcs which are too short.
         flag = df.length < self._min_len
@@ -353,7 +503,7 @@ class Validator:
         errors = set()
 
         # Fetch dataframe.
-        df = self.dfs[dataset].copy(deep=True)
+        df = self.dfs[dataset]
 
         # Flag complex (non-simple) geometries.
         flag = ~df.is_simple
@@ -375,7 +525,7 @@ class Validator:
         errors = set()
 
         # Fetch dataframe.
-        df = self.dfs[dataset].copy(deep=True)
+        df = self.dfs[dataset]
 
         # Flag arcs which are too short.
         flag = df.length == 0
@@ -398,7 +548,7 @@ class Validator:
         errors = set()
 
         # Fetch dataframe.
-        df = self.dfs[dataset].copy(deep=True)
+        df = self.dfs[dataset]
 
         # Filter to non-default and non-zero dates.
         default = self.defaults_all[dataset][col]
@@ -433,7 +583,7 @@ class Validator:
         errors = set()
 
         # Fetch dataframe.
-        df = self.dfs[dataset].copy(deep=True)
+        df = self.dfs[dataset]
 
         # Filter to non-default and non-zero dates.
         default = self.defaults_all[dataset][col]
@@ -460,7 +610,7 @@ class Validator:
         errors = set()
 
         # Fetch dataframe.
-        df = self.dfs[dataset].copy(deep=True)
+        df = self.dfs[dataset]
 
         # Filter to non-default and non-zero dates.
         default = self.defaults_all[dataset][col]
@@ -501,7 +651,7 @@ class Validator:
         dups = pd.Series()
 
         # Fetch dataframe.
-        df = self.dfs[dataset].copy(deep=True)
+        df = self.dfs[dataset]
 
         # LineStrings.
         if df.geom_type.iloc[0] == "LineString":
@@ -510,11 +660,40 @@ class Validator:
             df = df.loc[df.length.duplicated(keep=False)]
             if len(df):
 
-                # Filter arcs to those with duplicated nodes.
-                df = df.loc[df[["pt_start", "pt_end"]].agg(set, axis=1).map(tuple).duplicated(keep=False)]
-
-                # Flag duplicated geometries.
-                dups = df.loc[df["geometry"].map(lambda g1: df["geometry"].map(lambda g2: g1.equals(g2)).sum() > 1)]
+                # Compile candidate buckets from length and node set.
+                # Note: duplicated geometries necessarily share both, therefore equality is only tested within buckets.
+                buckets = pd.Series(zip(df.length, map(lambda pts: tuple(sorted(pts)), zip(df["pt_start"],
+                                                                                            df["pt_end"]))),
+                                    index=df.index)
+
+                # Filter arcs to those with duplicated buckets.
+                df = df.loc[buckets.duplicated(keep=False)]
+                if len(df):
+
+                    # Hash the orientation-normalized, rounded coordinates of each arc.
+                    coords, idxs = shapely.get_coordinates(df["geometry"].normalize().values, return_index=True)
+                    coords = np.split(np.round(coords, 3), np.cumsum(np.bincount(idxs, minlength=len(df)))[:-1])
+                    hashes = map(lambda pts: hash(pts.tobytes()), coords)
+
+                    # Compile classes of equal geometries for each bucket.
+                    # Note: equality is confirmed against one representative per class, starting with classes of the
+                    # same hash. Remaining classes are still tested since equal geometries may have differing vertices.
+                    classes = defaultdict(list)
+                    for identifier, bucket, geom_hash, geom in zip(df.index, buckets.loc[df.index], hashes,
+                                                                   df["geometry"]):
+
+                        candidates = sorted(classes[bucket], key=lambda cls: cls["hash"] != geom_hash)
+                        cls = next(filter(lambda cls: cls["geometry"].equals(geom), candidates), None)
+
+                        if cls:
+                            cls["ids"].append(identifier)
+                        else:
+                            classes[bucket].append({"geometry": geom, "hash": geom_hash, "ids": [identifier]})
+
+                    # Flag duplicated geometries.
+                    dup_ids = set(chain.from_iterable(cls["ids"] for cls in chain.from_iterable(classes.values())
+                                                      if len(cls["ids"]) > 1))
+                    dups = df.loc[df.index.isin(dup_ids)]
 
         # Points.
         else:
@@ -542,17 +721,17 @@ class Validator:
         errors = set()
 
         # Fetch dataframe.
-        df = self.dfs[dataset].copy(deep=True)
+        df = self.dfs[dataset]
 
-        # Query arcs which overlap each segment.
-        overlaps = df["geometry"].map(lambda g: set(df.sindex.query(g, predicate="overlaps")))
+        # Query overlapping arcs as (arc, overlapping arc) index pairs.
+        idxs, _ = df.sindex.query(df["geometry"], predicate="overlaps")
 
         # Flag arcs which have one or more overlapping segments.
-        flag = overlaps.map(len) > 0
+        flag = np.unique(idxs)
 
         # Compile error logs.
-        if sum(flag):
-            errors.update(set(overlaps.loc[flag].index))
+        if len(flag):
+            errors.update(set(df.index.values[flag]))
 
         return errors
 
@@ -569,7 +748,7 @@ class Validator:
         errors = set()
 
         # Fetch dataframe.
-        df = self.dfs[dataset].copy(deep=True)
+        df = self.dfs[dataset]
 
         # Filter to non-default and non-none values.
         default = self.defaults_all[dataset][col]
@@ -596,7 +775,7 @@ class Validator:
         errors = set()
 
         # Fetch dataframe.
-        df = self.dfs[dataset].copy(deep=True)
+        df = self.dfs[dataset]
 
         # Filter to records with duplicated nids and non-default and non-none exitnbr.
         default = self.defaults_all[dataset]["exitnbr"]
@@ -631,7 +810,7 @@ class Validator:
         errors = set()
 
         # Fetch dataframe.
-        df = self.dfs[dataset].copy(deep=True)
+        df = self.dfs[dataset]
 
         # Compile exitnbr default and valid roadclass values.
         default_exitnbr = self.defaults_all[dataset]["exitnbr"]
@@ -657,8 +836,8 @@ class Validator:
         errors = set()
 
         # Fetch dataframes.
-        ferryseg = self.dfs[dataset].copy(deep=True)
-        roadseg = self.dfs["roadseg"].copy(deep=True)
+        ferryseg = self.dfs[dataset]
+        roadseg = self.dfs["roadseg"]
 
         # Compile nodes.
         nodes_ferryseg = set(pd.concat([ferryseg["pt_start"], ferryseg["pt_end"]]))
@@ -677,6 +856,35 @@ class Validator:
 
         return errors
 
+    def get_state(self) -> dict:
+        """
+        Compiles the validation state (record hashes, record bounds, and errors) required for a subsequent incremental
+        run.
+
+        :return dict: dictionary of record hashes, record bounds, and errors.
+        """
+
+        return {
+            "hashes": self.hashes,
+            "bounds": self.bounds,
+            "errors": {code: dict(errors) for code, errors in self.errors.items()}
+        }
+
+    @staticmethod
+    def hash_records(df: Union[gpd.GeoDataFrame, pd.DataFrame]) -> pd.Series:
+        """
+        Generates a content hash for each record from all attributes, including geometry.
+
+        :param Union[gpd.GeoDataFrame, pd.DataFrame] df: (Geo)DataFrame.
+        :return pd.Series: Series of record hashes.
+        """
+
+        # Substitute geometries for their WKB representation.
+        if "geometry" in df.columns:
+            df = pd.DataFrame(df).assign(geometry=df["geometry"].to_wkb())
+
+        return pd.util.hash_pandas_object(df, index=True)
+
     def identifiers_nid_linkages(self, dataset: str, col: str) -> set:
         """
         Validates: NID linkages must be valid.
@@ -711,7 +919,7 @@ class Validator:
         }
 
         # Fetch dataframe.
-        df = self.dfs[dataset].copy(deep=True)
+        df = self.dfs[dataset]
 
         # Filter to non-default and non-none values.
         default = self.defaults_all[dataset][col]
@@ -746,7 +954,7 @@ class Validator:
         errors = set()
 
         # Fetch dataframe.
-        df = self.dfs[dataset].copy(deep=True)
+        df = self.dfs[dataset]
 
         # Filter to non-default dates.
         default = self.defaults_all[dataset]["nbrlanes"]
@@ -761,6 +969,42 @@ class Validator:
 
         return errors
 
+    def query_neighbours(self, dataset: str, bounds: pd.DataFrame) -> set:
+        """
+        Queries the records within the validation distance tolerance of the given bounds.
+
+        :param str dataset: name of the dataset to be queried.
+        :param pd.DataFrame bounds: DataFrame of bounds with columns: minx, miny, maxx, maxy.
+        :return set: set containing identifiers of the queried records.
+        """
+
+        if not len(bounds):
+            return set()
+
+        # Query records intersecting the bounds expanded by the distance tolerance.
+        boxes = shapely.box(bounds["minx"] - self._min_dist, bounds["miny"] - self._min_dist,
+                            bounds["maxx"] + self._min_dist, bounds["maxy"] + self._min_dist)
+        _, idxs = self.dfs[dataset].sindex.query(boxes, predicate="intersects")
+
+        return set(self.dfs[dataset].index.values[np.unique(idxs)])
+
+    def run_task(self, task: Tuple[int, str, Union[str, None]]) -> Tuple[int, str, set]:
+        """
+        Executes a single validation task.
+
+        :param Tuple[int, str, Union[str, None]] task: validation code, dataset name, and optional column name.
+        :return Tuple[int, str, set]: validation code, dataset name, and set containing identifiers of erroneous
+            records.
+        """
+
+        code, dataset, col = task
+        func = self.validations[code]["func"]
+
+        # Execute validation.
+        errors = func(dataset, col=col) if col else func(dataset)
+
+        return code, dataset, errors
+
     def speed_(self, dataset: str) -> set:
         """
         Validates: Attribute \"speed\" must be between 5 and 120, inclusively.
@@ -772,7 +1016,7 @@ class Validator:
         errors = set()
 
         # Fetch dataframe.
-        df = self.dfs[dataset].copy(deep=True)
+        df = self.dfs[dataset]
 
         # Filter to non-default dates.
         default = self.defaults_all[dataset]["speed"]
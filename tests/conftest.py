@@ -0,0 +1,93 @@
+import pytest
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator
+
+filepath = Path(__file__).resolve()
+sys.path.insert(1, (filepath.parents[1] / "src").as_posix())
+
+
+class RemoteHandler(BaseHTTPRequestHandler):
+    """Serves the content of a :class:`Remote`, honouring conditional (If-None-Match) and range (Range, If-Range)
+    requests."""
+
+    def do_GET(self) -> None:
+        """Serves a GET request."""
+
+        remote = self.server.remote
+        remote.requests.append(dict(self.headers))
+        content, etag = remote.content, remote.etag
+
+        # Remote content has not changed.
+        if etag and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        # Resolve range request, ignored if the remote content changed.
+        start, status = 0, 200
+        if "Range" in self.headers and self.headers.get("If-Range", etag) == etag:
+            start, status = int(self.headers["Range"].split("=")[-1].rstrip("-")), 206
+
+            if start >= len(content):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(content)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+        body = content[start:]
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{len(content) - 1}/{len(content)}")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+
+        # Drop the connection partway through the content, once.
+        if remote.drop_after is not None:
+            body, remote.drop_after = body[:remote.drop_after], None
+            self.close_connection = True
+
+        self.wfile.write(body)
+        remote.bytes_sent += len(body)
+
+    def log_message(self, *args) -> None:
+        """Silences request logging."""
+
+        pass
+
+
+class Remote:
+    """Content served by a local HTTP server."""
+
+    def __init__(self, url: str) -> None:
+        """
+        :param str url: url of the content.
+        """
+
+        self.url = url
+        self.content = b""
+        self.etag = None
+        self.drop_after = None
+        self.requests = list()
+        self.bytes_sent = 0
+
+
+@pytest.fixture
+def remote() -> Iterator[Remote]:
+    """Yields a :class:`Remote` served by a local HTTP server for the duration of a test."""
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RemoteHandler)
+    server.remote = Remote(f"http://127.0.0.1:{server.server_port}/content.zip")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server.remote
+
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,78 @@
+import geopandas as gpd
+import io
+import os
+import pytest
+import sys
+import zipfile
+from pathlib import Path
+from shapely import LineString, Point
+
+sys.path.insert(1, (Path(__file__).resolve().parents[1] / "src/conform").as_posix())
+import conform
+from utils import helpers
+
+
+@pytest.fixture
+def previous_vintage(remote, tmp_path, monkeypatch: pytest.MonkeyPatch) -> conform.Conform:
+    """Yields a :class:`~conform.Conform` which retrieves the previous NRN vintage from the local HTTP server."""
+
+    # Serve a zipped GeoPackage.
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zip_f:
+        zip_f.writestr("NRN_ON_1_0_GPKG_en.gpkg", os.urandom(10000))
+    remote.content, remote.etag = buffer.getvalue(), '"v1"'
+
+    # Redirect the download url to the local HTTP server.
+    load_yaml = helpers.load_yaml
+    monkeypatch.setattr(helpers, "load_yaml", lambda path: {"previous_nrn_vintage": {"on": remote.url}} if
+                        Path(path).name == "downloads.yaml" else load_yaml(path))
+
+    conformer = conform.Conform.__new__(conform.Conform)
+    conformer.source = "on"
+    conformer.download_old = True
+    conformer.src_old = {"gpkg": tmp_path / "on_old.gpkg"}
+    conformer.cache_dir = tmp_path / "cache"
+
+    return conformer
+
+
+def test_cached_download_is_reused(previous_vintage, remote):
+    previous_vintage.download_previous_vintage()
+    gpkg = previous_vintage.src_old["gpkg"]
+    bytes_sent, mtime = remote.bytes_sent, gpkg.stat().st_mtime_ns
+
+    assert bytes_sent == len(remote.content)
+
+    previous_vintage.download_previous_vintage()
+
+    assert remote.requests[-1]["If-None-Match"] == '"v1"'
+    assert remote.bytes_sent == bytes_sent
+    assert gpkg.stat().st_mtime_ns == mtime
+
+
+@pytest.mark.parametrize("content", ["", "etag: '\"v1\"\nlast_modified: [\n"])
+def test_invalid_cache_yaml_is_a_cache_miss(previous_vintage, remote, content):
+    previous_vintage.download_previous_vintage()
+    next(previous_vintage.cache_dir.glob("*.yaml")).write_text(content)
+
+    previous_vintage.download_previous_vintage()
+
+    assert "If-None-Match" not in remote.requests[-1]
+    assert remote.bytes_sent == 2 * len(remote.content)
+
+
+def test_failed_source_in_worker_exits(tmp_path):
+    line = LineString([(-75.0, 45.0), (-75.1, 45.1)])
+    gpd.GeoDataFrame({"name": ["a"]}, geometry=[line], crs="EPSG:4617").to_file(tmp_path / "valid.gpkg")
+    gpd.GeoDataFrame({"name": ["a", "b"]}, geometry=[line, Point(-75.0, 45.0)], crs="EPSG:4617")\
+        .to_file(tmp_path / "mixed.gpkg")
+
+    conformer = conform.Conform.__new__(conform.Conform)
+    conformer.processes = 2
+    conformer.src = tmp_path
+    conformer.source_attributes = {
+        name: {"data": {"filename": f"{name}.gpkg", "layer": name, "query": None, "spatial": True,
+                        "crs": "EPSG:4617"}, "conform": {"roadseg": {"nid": "name"}}} for name in ("valid", "mixed")}
+
+    with pytest.raises(SystemExit):
+        conformer.gen_source_dataframes()
@@ -0,0 +1,79 @@
+import hashlib
+import os
+import pytest
+from utils import helpers
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Disables the backoff between download attempts."""
+
+    monkeypatch.setattr(helpers.time, "sleep", lambda seconds: None)
+
+
+def test_resume_after_dropped_connection(remote, tmp_path):
+    remote.content, remote.etag, remote.drop_after = os.urandom(300000), '"v1"', 100000
+    dst = tmp_path / "content.zip"
+
+    response, digest = helpers.download(remote.url, dst)
+
+    assert dst.read_bytes() == remote.content
+    assert digest == hashlib.sha256(remote.content).hexdigest()
+    assert len(remote.requests) == 2
+    assert remote.requests[1]["Range"].startswith("bytes=")
+    assert remote.requests[1]["If-Range"] == '"v1"'
+    assert remote.bytes_sent < 2 * len(remote.content)
+    assert not dst.with_name("content.zip.part").exists()
+    assert not dst.with_name("content.zip.part.validator").exists()
+
+
+def test_complete_part_is_not_downloaded_again(remote, tmp_path):
+    remote.content, remote.etag = os.urandom(1000), '"v1"'
+    dst = tmp_path / "content.zip"
+    dst.with_name("content.zip.part").write_bytes(remote.content)
+    dst.with_name("content.zip.part.validator").write_text('"v1"')
+
+    response, digest = helpers.download(remote.url, dst)
+
+    assert response.status_code == 416
+    assert remote.bytes_sent == 0
+    assert dst.read_bytes() == remote.content
+    assert digest == hashlib.sha256(remote.content).hexdigest()
+
+
+def test_part_is_discarded_if_remote_changed(remote, tmp_path):
+    old, new = os.urandom(1000), os.urandom(1000)
+    remote.content, remote.etag = new, '"v2"'
+    dst = tmp_path / "content.zip"
+    dst.with_name("content.zip.part").write_bytes(old[:500])
+    dst.with_name("content.zip.part.validator").write_text('"v1"')
+
+    response, digest = helpers.download(remote.url, dst)
+
+    assert remote.requests[0]["If-Range"] == '"v1"'
+    assert response.status_code == 200
+    assert dst.read_bytes() == new
+    assert digest == hashlib.sha256(new).hexdigest()
+
+
+def test_part_without_validator_is_discarded(remote, tmp_path):
+    remote.content, remote.etag = os.urandom(1000), '"v1"'
+    dst = tmp_path / "content.zip"
+    dst.with_name("content.zip.part").write_bytes(os.urandom(500))
+
+    response, digest = helpers.download(remote.url, dst)
+
+    assert "Range" not in remote.requests[0]
+    assert dst.read_bytes() == remote.content
+
+
+def test_checksum_mismatch(remote, tmp_path):
+    remote.content, remote.etag = os.urandom(1000), '"v1"'
+    dst = tmp_path / "content.zip"
+
+    with pytest.raises(SystemExit):
+        helpers.download(remote.url, dst, checksum=hashlib.sha256(b"other").hexdigest())
+
+    assert not dst.exists()
+    assert not dst.with_name("content.zip.part").exists()
+    assert not dst.with_name("content.zip.part.validator").exists()